@@ -1,10 +1,31 @@
+FNV_OFFSET_BASIS = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
 class HashTable:
-    def __init__(self, size):
+    def __init__(self, size, seed=0, max_load_factor=0.75):
         self.size = size
+        self.seed = seed
+        self.max_load_factor = max_load_factor
         self.table = [[] for _ in range(size)]
+        self.count = 0
+        # bumped on every resize, so a position can tell whether it was taken in the current layout
+        self.generation = 0
+        # (bucket, index) of every key in the previous generation -> its (bucket, index) now
+        self.forwarding = {}
+        self.resize_events = []
+        self._basis = FNV_OFFSET_BASIS ^ (seed & MASK_64)
+
+    def hash_value(self, key):
+        # 64-bit FNV-1a over the UTF-8 bytes, so anagrams no longer collide; the seed perturbs the basis
+        h = self._basis
+        for byte in key.encode('utf-8'):
+            h = ((h ^ byte) * FNV_PRIME) & MASK_64
+        return h
 
     def hash(self, key):
-        return sum(ord(c) for c in key) % self.size
+        return self.hash_value(key) % self.size
 
     def insert(self, key):
         index = self.hash(key)
@@ -15,6 +36,46 @@ class HashTable:
                 return
 
         bucket.append(key)
+        self.count += 1
+        if self.count > self.max_load_factor * self.size:
+            self.resize(2 * self.size + 1)
+
+    def resize(self, new_size):
+        # Rehashes every key into a new bucket array and drops the old one. Only the forwarding map
+        # from the previous layout is kept, so positions handed out just before the resize can be moved.
+        old_table = self.table
+        self.resize_events.append({"generation": self.generation, "from_size": self.size, "to_size": new_size,
+                                   "count": self.count})
+        self.generation += 1
+
+        self.size = new_size
+        self.table = [[] for _ in range(new_size)]
+        self.forwarding = {}
+        for old_index, bucket in enumerate(old_table):
+            for old_position, key in enumerate(bucket):
+                index = self.hash(key)
+                self.forwarding[(old_index, old_position)] = (index, len(self.table[index]))
+                self.table[index].append(key)
+
+    def stats(self):
+        # -> occupancy and collision figures computed from the current layout. Probes are key
+        # comparisons: a hit on the i-th key of a bucket costs i, a miss costs the whole bucket.
+        lengths = [len(bucket) for bucket in self.table]
+        histogram = {}
+        for length in lengths:
+            histogram[length] = histogram.get(length, 0) + 1
+        hit_probes = sum(length * (length + 1) // 2 for length in lengths)
+        return {
+            "size": self.size,
+            "count": self.count,
+            "load_factor": self.count / self.size,
+            "max_load_factor": self.max_load_factor,
+            "chain_length_histogram": dict(sorted(histogram.items())),
+            "max_chain_length": max(lengths, default=0),
+            "average_probes_hit": hit_probes / self.count if self.count else 0.0,
+            "average_probes_miss": self.count / self.size,
+            "resizes": list(self.resize_events),
+        }
 
     def lookup(self, key):
         index = self.hash(key)
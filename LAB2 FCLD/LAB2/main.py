@@ -35,5 +35,15 @@ if __name__ == '__main__':
     st.add("h")
     st.add("k")
 
-    print("\nSymbol Table Structure After Adding Colliding Keys:")
+    print("\nSymbol Table Structure After Adding More Keys (the table grows):")
     print(st)
+
+    print("\nPositions taken before the table grew:")
+    print("Term found at stale position for 'a':", st.find_by_pos(pos_a))
+    pos_a = st.migrate_position(pos_a)
+    print("Position of 'a' migrated to the current layout:", pos_a)
+    print("Term found at migrated position for 'a':", st.find_by_pos(pos_a))
+
+    print("\nHash table statistics:")
+    for name, value in st.stats().items():
+        print(f"{name}: {value}")
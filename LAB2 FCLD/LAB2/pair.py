@@ -1,7 +1,9 @@
 class Pair:
-    def __init__(self, first, second):
+    def __init__(self, first, second, generation=0):
         self.first = first
         self.second = second
+        # hash table generation the position was taken in, see HashTable.resize
+        self.generation = generation
 
     def __str__(self):
         return f"({self.first}, {self.second})"
@@ -2,8 +2,8 @@ from hash_table import HashTable
 from pair import Pair
 
 class SymbolTable:
-    def __init__(self, size=100):
-        self.table = HashTable(size)
+    def __init__(self, size=100, seed=0):
+        self.table = HashTable(size, seed=seed)
 
     def get_size(self):
         return self.table.size
@@ -17,19 +17,34 @@ class SymbolTable:
 
         for index, key in enumerate(bucket):
             if key == term:
-                return Pair(hash_value, index)
+                return Pair(hash_value, index, self.table.generation)
 
         return None
 
     def find_by_pos(self, pos):
-        if pos is None:
+        # a position from before a resize is stale and finds nothing; migrate_position moves it first
+        if pos is None or pos.generation != self.table.generation:
             return None
 
+        if not 0 <= pos.first < self.table.size:
+            return None
         bucket = self.table.table[pos.first]
         if 0 <= pos.second < len(bucket):
             return bucket[pos.second]
         return None
 
+    def migrate_position(self, pos):
+        # -> Pair valid in the current layout for a Pair taken just before the last resize, through
+        # the table's forwarding map; None for an older Pair
+        if pos is None or pos.generation == self.table.generation:
+            return pos
+        if pos.generation != self.table.generation - 1:
+            return None
+        forwarded = self.table.forwarding.get((pos.first, pos.second))
+        if forwarded is None:
+            return None
+        return Pair(forwarded[0], forwarded[1], self.table.generation)
+
     def contains_term(self, term):
         return self.table.lookup(term)
 
@@ -37,5 +52,8 @@ class SymbolTable:
         if not self.contains_term(term):
             self.table.insert(term)
 
+    def stats(self):
+        return self.table.stats()
+
     def __str__(self):
         return str(self.table)
@@ -11,6 +11,7 @@ def print_menu():
     print("5. Print initial state.")
     print("6. Print is deterministic.")
     print("7. Check if sequence is accepted by DFA.")
+    print("8. Minimize FA and write it to file.")
     print("0. Exit.")
 
 
@@ -20,6 +21,8 @@ def options_for_dfa():
 
     # Get the FA file and parse it
     fa_file = "Input_Output/FA.in"
+    # the minimized FA goes to its own file unless the user names another, so FA.in is never overwritten
+    minimized_fa_file = "Input_Output/FA_minimized.in"
 
     if not os.path.exists(fa_file):
         print(f"Error: The FA file '{fa_file}' does not exist.")
@@ -75,6 +78,14 @@ def options_for_dfa():
                 print(f"Sequence '{input_string}' is invalid.")
             print()
 
+        elif option == '8':
+            output_file = input(f"Enter the output file (leave empty for '{minimized_fa_file}'): ").strip() \
+                or minimized_fa_file
+            minimal_fa = fa.minimize()
+            minimal_fa.write_fa_file(output_file)
+            print(f"Minimized FA with {len(minimal_fa.get_states())} states written to '{output_file}'.")
+            print()
+
         else:
             print("Invalid option! Please try again.")
             print_menu()
@@ -86,18 +97,19 @@ def run_scanner():
     print("Available program files:")
     for idx, file in enumerate(files, 1):
         print(f"{idx}. {file}")
+    print(f"{len(files) + 1}. All files (scanned in parallel)")
 
     try:
         selected_index = int(input("Enter the number of the file you want to run: ")) - 1
-        if selected_index < 0 or selected_index >= len(files):
+        if selected_index < 0 or selected_index > len(files):
             print("Invalid file selection.")
             return
     except ValueError:
         print("Invalid input. Please enter a valid number.")
         return
 
-    selected_file = files[selected_index]
-    print(f"Running scanner for {selected_file}...")
+    selected_files = files if selected_index == len(files) else [files[selected_index]]
+    print(f"Running scanner for {', '.join(selected_files)}...")
 
     token_file = "token.in"
 
@@ -105,12 +117,18 @@ def run_scanner():
         print(f"Error: The token file '{token_file}' does not exist.")
         return
 
-    if not os.path.exists(selected_file):
-        print(f"Error: The program file '{selected_file}' does not exist.")
-        return
+    for selected_file in selected_files:
+        if not os.path.exists(selected_file):
+            print(f"Error: The program file '{selected_file}' does not exist.")
+            return
 
     scanner = Scanner(token_file)
-    if scanner.scan(selected_file):
+    if len(selected_files) > 1:
+        success = scanner.scan_many(selected_files)
+    else:
+        success = scanner.scan(selected_files[0])
+
+    if success:
         print("Scanning completed successfully.")
         scanner.write_outputs()
     else:
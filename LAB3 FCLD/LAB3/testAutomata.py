@@ -0,0 +1,44 @@
+import itertools
+import os
+import unittest
+from LAB3.utils.finite_automata import FiniteAutomaton
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Input_Output")
+
+class TestAutomata(unittest.TestCase):
+
+    def load(self, name, engine="set"):
+        fa = FiniteAutomaton(engine)
+        fa.parse_fa_file(os.path.join(INPUT_DIR, name))
+        return fa
+
+    def assert_same_language(self, name, alphabet, max_length):
+        # every NFA engine, the subset construction, the minimal DFA and its dense tables accept the same strings
+        automata = {engine: self.load(name, engine) for engine in FiniteAutomaton.ENGINES}
+        dfa = automata["set"].determinize()
+        minimal = dfa.minimize()
+        automata.update(dfa=dfa, minimal=minimal, dense=minimal.to_dense())
+        for length in range(max_length + 1):
+            for word in itertools.product(alphabet, repeat=length):
+                word = "".join(word)
+                expected = automata["set"].is_accepted(word)
+                for kind, automaton in automata.items():
+                    self.assertEqual(automaton.is_accepted(word), expected, f"{kind} on {word!r}")
+
+    def test_nfa(self):
+        self.assert_same_language("FA.in", "ab", 8)
+
+    def test_character_classes(self):
+        self.assert_same_language("identifier_fa.txt", "aZ_0", 4)
+        self.assert_same_language("constant_fa.txt", "-+019a", 4)
+
+    def test_minimal(self):
+        dfa = self.load("FA.in").determinize()
+        minimal = dfa.minimize()
+        self.assertLessEqual(len(minimal.get_states()), len(dfa.get_states()))
+        self.assertEqual(len(minimal.minimize().get_states()), len(minimal.get_states()))
+        self.assertTrue(minimal.check_if_deterministic())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from LAB3.utils import compiled_lexer
+from LAB3.utils.compiled_lexer import CompiledLexer
+
+LAB3_DIR = os.path.dirname(os.path.abspath(__file__))
+IDENTIFIER_FA_FILE = os.path.join(LAB3_DIR, "Input_Output", "identifier_fa.txt")
+CONSTANT_FA_FILE = os.path.join(LAB3_DIR, "Input_Output", "constant_fa.txt")
+
+class TestCompiledLexer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, "cache")
+        compiled_lexer._compiled.clear()
+
+    def tearDown(self):
+        compiled_lexer._compiled.clear()
+        shutil.rmtree(self.directory)
+
+    def token_file(self, name, tokens):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as file:
+            file.write("\n".join(tokens))
+        return path
+
+    def load(self, token_file):
+        compiled_lexer._compiled.clear()
+        return CompiledLexer.load(token_file, IDENTIFIER_FA_FILE, CONSTANT_FA_FILE, cache_dir=self.cache_dir)
+
+    def cached(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_shared_cache_dir(self):
+        first = self.token_file("first.in", ["if", "+"])
+        second = self.token_file("second.in", ["while", "-"])
+        self.load(first)
+        self.load(second)
+        self.assertEqual(len(self.cached()), 2)
+        # both specifications are read back instead of evicting each other
+        cached = self.cached()
+        self.assertEqual(self.load(first).token_list, ["if", "+"])
+        self.assertEqual(self.load(second).token_list, ["while", "-"])
+        self.assertEqual(self.cached(), cached)
+
+    def test_stale_entry_replaced(self):
+        tokens = self.token_file("tokens.in", ["if"])
+        self.load(tokens)
+        stale = self.cached()
+        self.token_file("tokens.in", ["if", "else"])
+        self.assertEqual(self.load(tokens).token_list, ["if", "else"])
+        self.assertEqual(len(self.cached()), 1)
+        self.assertNotEqual(self.cached(), stale)
+
+    def test_corrupt_entry_rebuilt(self):
+        tokens = self.token_file("tokens.in", ["if"])
+        self.load(tokens)
+        path = os.path.join(self.cache_dir, self.cached()[0])
+        with open(path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b"\0")
+        self.assertEqual(self.load(tokens).token_list, ["if"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from array import array
+from LAB3.utils.binary_pif import HEADER, TYPECODES
+from LAB3.utils.compiled_lexer import CompiledLexer
+from LAB3.utils.scanner import Scanner
+from LAB3.utils.symbol_table_snapshot import SymbolTableSnapshot
+
+LAB3_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_DIR = os.path.join(LAB3_DIR, "Input_Output")
+TOKEN_FILE = os.path.join(LAB3_DIR, "token.in")
+PROGRAMS = [os.path.join(INPUT_DIR, name) for name in ("p1.txt", "p2.txt", "p3.txt", "p1err.txt")]
+# PIF and symbol table terms (in id order) of every program, as written by the original scanner
+EXPECTED_DIR = os.path.join(INPUT_DIR, "expected")
+
+
+def read_binary_pif(path):
+    # -> list of (token name, position, line) entries of a binary PIF, see LAB3.utils.binary_pif
+    with open(path, 'rb') as file:
+        data = file.read()
+    _, _, _, count, _, table_size, code_width, position_width, line_width = HEADER.unpack_from(data)
+    offset = HEADER.size + -HEADER.size % 4
+    names = data[offset:offset + table_size].decode('utf-8').split("\n")
+    offset += table_size + -table_size % 4
+    columns = []
+    for width in (code_width, position_width, line_width):
+        columns.append(array(TYPECODES[width], data[offset:offset + width * count]))
+        offset += width * count + -(width * count) % 4
+    codes, positions, lines = columns
+    return [(names[code], position - 1, line) for code, position, line in zip(codes, positions, lines)]
+
+class TestScanner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.compiled_lexer = CompiledLexer.load(TOKEN_FILE, os.path.join(INPUT_DIR, "identifier_fa.txt"),
+                                                os.path.join(INPUT_DIR, "constant_fa.txt"), cache_dir=cls.cache_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.cache_dir)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def scanner(self, backend="chained"):
+        return Scanner(TOKEN_FILE, backend, self.compiled_lexer)
+
+    def scan(self, program, backend="chained"):
+        scanner = self.scanner(backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scanner.scan(program)
+        return scanner
+
+    def expected(self, program, extension):
+        name = os.path.splitext(os.path.basename(program))[0]
+        with open(os.path.join(EXPECTED_DIR, f"{name}.{extension}")) as file:
+            return file.read().splitlines()
+
+    def test_expected_output(self):
+        for backend in ("chained", "compact"):
+            for program in PROGRAMS:
+                with self.subTest(backend=backend, program=program):
+                    scanner = self.scan(program, backend)
+                    pif = [f"{token} {pos} {token_type}" for token, pos, token_type in scanner.pif]
+                    self.assertEqual(pif, self.expected(program, "pif"))
+                    self.assertEqual(scanner.symbol_table.terms(), self.expected(program, "st"))
+
+                    pif_file = os.path.join(self.directory, "PIF.out")
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        self.scanner(backend).write_pif_stream(program, pif_file, flush_every=2)
+                    with open(pif_file) as file:
+                        self.assertEqual(file.read().splitlines(), pif)
+
+    def test_binary_pif_round_trip(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                scanner = self.scan(program)
+                terms = scanner.symbol_table.terms()
+                pif_file = os.path.join(self.directory, "PIF.bin")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.scanner().write_binary_pif(program, pif_file)
+                entries = read_binary_pif(pif_file)
+                self.assertEqual(len(entries), len(scanner.pif))
+                for (name, position, _), (token, pos, token_type) in zip(entries, scanner.pif):
+                    self.assertEqual(position, pos)
+                    if pos == -1:
+                        self.assertEqual(name, token)
+                    else:
+                        self.assertEqual(name, f"<{token_type}>")
+                        self.assertEqual(terms[position], token)
+                lines = [line for _, _, line in entries]
+                self.assertEqual(lines, sorted(lines))
+
+    def test_snapshot_round_trip(self):
+        scanner = self.scan(PROGRAMS[2])
+        terms = scanner.symbol_table.terms()
+        snapshot_file = os.path.join(self.directory, "ST.bin")
+        scanner.write_symbol_table_snapshot(snapshot_file)
+        with SymbolTableSnapshot(snapshot_file) as snapshot:
+            self.assertEqual(snapshot.terms(), terms)
+            self.assertEqual([snapshot.id_of(term) for term in terms], list(range(len(terms))))
+            self.assertIsNone(snapshot.id_of("not_a_symbol"))
+
+        # a scanner continuing from the snapshot keeps every id and numbers new symbols after them
+        for backend in ("chained", "compact"):
+            with self.subTest(backend=backend):
+                resumed = self.scanner(backend)
+                resumed.load_symbol_table(snapshot_file)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    resumed.scan(PROGRAMS[0])
+                self.assertEqual(resumed.symbol_table.terms()[:len(terms)], terms)
+
+    def scan_serially(self, backend):
+        # -> scanner that scanned every program in turn, and the errors of each program tagged with its path
+        scanner = self.scanner(backend)
+        errors = []
+        for path in PROGRAMS:
+            scanned = len(scanner.errors)
+            with contextlib.redirect_stdout(io.StringIO()):
+                scanner.scan(path)
+            errors.extend(f"{path}: {error}" for error in scanner.errors[scanned:])
+        return scanner, errors
+
+    def test_scan_many_matches_serial_scan(self):
+        for backend in ("chained", "compact"):
+            for chunk_lines in (None, 3):
+                with self.subTest(backend=backend, chunk_lines=chunk_lines):
+                    serial, errors = self.scan_serially(backend)
+                    parallel = self.scanner(backend)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        success = parallel.scan_many(PROGRAMS, workers=2, chunk_lines=chunk_lines)
+                    self.assertFalse(success)
+                    self.assertEqual(parallel.pif, serial.pif)
+                    self.assertEqual(parallel.symbol_table.terms(), serial.symbol_table.terms())
+                    self.assertEqual(parallel.errors, errors)
+
+    def test_errors_name_their_file(self):
+        scanner = self.scanner()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(scanner.scan_many(PROGRAMS[2:], workers=2))
+        self.assertTrue(scanner.errors)
+        self.assertTrue(all(error.startswith(PROGRAMS[3] + ": Lexical error at line ") for error in scanner.errors))
+
+
+if __name__ == '__main__':
+    unittest.main()
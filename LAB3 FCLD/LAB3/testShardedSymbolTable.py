@@ -0,0 +1,65 @@
+import sys
+import threading
+import unittest
+from LAB3.utils.sharded_symbol_table import ShardedSymbolTable
+
+class TestShardedSymbolTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = ShardedSymbolTable(shards=8, size=16)
+
+    def test_get_or_add(self):
+        first = self.table.get_or_add("a")
+        second = self.table.get_or_add("b")
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.table.get_or_add("a"), first)
+        self.assertEqual(self.table.id_of("b"), second)
+        self.assertEqual(self.table.term_by_id(first), "a")
+        self.assertIsNone(self.table.id_of("c"))
+        self.assertFalse(self.table.contains_term("c"))
+        self.assertEqual(self.table.count, 2)
+
+    def test_concurrent_get_or_add(self):
+        # every thread interns the same terms, each starting from a different place
+        terms = [f"identifier_{index}" for index in range(5000)]
+        threads_count = 8
+        results = [None] * threads_count
+        barrier = threading.Barrier(threads_count)
+
+        def worker(index):
+            start = index * len(terms) // threads_count
+            ordered = terms[start:] + terms[:start]
+            barrier.wait()
+            results[index] = {term: self.table.get_or_add(term) for term in ordered}
+
+        # switch threads as often as possible so lookups and inserts interleave inside a shard
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(index,)) for index in range(threads_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        # no lost or duplicated entries: one id per term, the same in every thread
+        self.assertEqual(self.table.count, len(terms))
+        self.assertEqual(sorted(self.table.terms()), sorted(terms))
+        for result in results:
+            self.assertEqual(result, results[0])
+        self.assertEqual(len(set(results[0].values())), len(terms))
+        for term, term_id in results[0].items():
+            self.assertEqual(self.table.term_by_id(term_id), term)
+            self.assertEqual(self.table.id_of(term), term_id)
+
+    def test_compact_backend(self):
+        table = ShardedSymbolTable(shards=4, backend="compact")
+        ids = [table.get_or_add(f"t{index}") for index in range(1000)]
+        self.assertEqual(len(set(ids)), 1000)
+        self.assertEqual([table.term_by_id(term_id) for term_id in ids], [f"t{index}" for index in range(1000)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import struct
+import sys
+from array import array
+
+# Layout, every section starting on a 4-byte boundary:
+#   header       magic, version, byte order, entry count, token name count, token table size
+#                and the width in bytes (1, 2 or 4) of each column, the smallest its values fit in
+#   token table  the TokenTable names joined by '\n' as UTF-8; a token code is an index in this list
+#   codes        count token codes
+#   positions    count symbol table ids plus one, so keywords and operators (-1) are stored as 0
+#   lines        count source line numbers
+MAGIC = b"PIFB"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxIIIBBBx")
+LITTLE, BIG = 0, 1
+TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+
+def _padded(data):
+    return data + bytes(-len(data) % 4)
+
+
+def _column(values):
+    # -> (width, bytes) of the values in the narrowest fixed width that holds all of them
+    largest = max(values, default=0)
+    width = 1 if largest < 1 << 8 else 2 if largest < 1 << 16 else 4
+    return width, array(TYPECODES[width], values).tobytes()
+
+
+def write_binary_pif(pif_file, token_names, codes, positions, lines):
+    # codes, positions and lines are integer sequences of the same length, positions -1 for none
+    table = "\n".join(token_names).encode('utf-8')
+    code_width, code_bytes = _column(codes)
+    position_width, position_bytes = _column([position + 1 for position in positions])
+    line_width, line_bytes = _column(lines)
+
+    byte_order = LITTLE if sys.byteorder == "little" else BIG
+    header = HEADER.pack(MAGIC, VERSION, byte_order, len(codes), len(token_names), len(table),
+                         code_width, position_width, line_width)
+    with open(pif_file, 'wb') as file:
+        file.write(b"".join((_padded(header), _padded(table), _padded(code_bytes), _padded(position_bytes),
+                             line_bytes)))
@@ -0,0 +1,174 @@
+from bisect import bisect_right
+
+MAX_CODE_POINT = 0x10FFFF
+_SPECIAL = set("\\[]^-")
+
+
+def is_class_label(symbol):
+    return len(symbol) >= 3 and symbol[0] == '[' and symbol[-1] == ']'
+
+
+def _escape(code):
+    char = chr(code)
+    if char in _SPECIAL or not char.isprintable() or char.isspace():
+        return f"\\u{code:04x}" if code <= 0xFFFF else f"\\U{code:08x}"
+    return char
+
+
+def interval_label(low, high):
+    # Single printable characters keep their literal label, anything else is written as a class
+    if low == high and chr(low) not in _SPECIAL and chr(low).isprintable() and not chr(low).isspace():
+        return chr(low)
+    if low == high:
+        return f"[{_escape(low)}]"
+    return f"[{_escape(low)}-{_escape(high)}]"
+
+
+class CharClass:
+    def __init__(self, label):
+        if not is_class_label(label):
+            raise ValueError(f"Invalid character class '{label}'")
+        self.label = label
+
+        body = label[1:-1]
+        self.negated = body.startswith('^') and len(body) > 1
+        if self.negated:
+            body = body[1:]
+
+        chars = self._unescape(body, label)
+        intervals = []
+        index = 0
+        while index < len(chars):
+            low, _ = chars[index]
+            # a '-' between two characters forms a range, anywhere else it is a literal
+            if index + 2 < len(chars) and chars[index + 1] == ('-', False):
+                high, _ = chars[index + 2]
+                if ord(high) < ord(low):
+                    raise ValueError(f"Invalid range '{low}-{high}' in character class '{label}'")
+                intervals.append((ord(low), ord(high)))
+                index += 3
+            else:
+                intervals.append((ord(low), ord(low)))
+                index += 1
+
+        self.intervals = self._merge(intervals)
+        if self.negated:
+            self.intervals = self._complement(self.intervals)
+        self._starts = [low for low, _ in self.intervals]
+
+    @staticmethod
+    def _unescape(body, label):
+        # -> list of (char, escaped) so an escaped '-' is never taken as a range operator
+        chars = []
+        index = 0
+        while index < len(body):
+            char = body[index]
+            if char != '\\':
+                chars.append((char, False))
+                index += 1
+                continue
+            if index + 1 >= len(body):
+                raise ValueError(f"Dangling escape in character class '{label}'")
+            kind = body[index + 1]
+            widths = {'x': 2, 'u': 4, 'U': 8}
+            if kind in widths:
+                digits = body[index + 2:index + 2 + widths[kind]]
+                if len(digits) != widths[kind]:
+                    raise ValueError(f"Invalid escape in character class '{label}'")
+                chars.append((chr(int(digits, 16)), True))
+                index += 2 + widths[kind]
+            elif kind == 's':
+                chars.append((' ', True))
+                index += 2
+            else:
+                chars.append((kind, True))
+                index += 2
+        return chars
+
+    @staticmethod
+    def _merge(intervals):
+        merged = []
+        for low, high in sorted(intervals):
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+            else:
+                merged.append((low, high))
+        return merged
+
+    @staticmethod
+    def _complement(intervals):
+        complement = []
+        next_low = 0
+        for low, high in intervals:
+            if low > next_low:
+                complement.append((next_low, low - 1))
+            next_low = high + 1
+        if next_low <= MAX_CODE_POINT:
+            complement.append((next_low, MAX_CODE_POINT))
+        return complement
+
+    def contains(self, char):
+        code = ord(char)
+        index = bisect_right(self._starts, code) - 1
+        return index >= 0 and code <= self.intervals[index][1]
+
+    def __str__(self):
+        return self.label
+
+
+class SymbolPartition:
+    def __init__(self, literals, char_classes):
+        # Splits the literal characters and class intervals into disjoint atoms. Every atom is
+        # either contained in or disjoint from each class, so automata can use atoms as symbols.
+        events = {}
+        for literal in literals:
+            code = ord(literal)
+            events[code] = events.get(code, 0) + 1
+            events[code + 1] = events.get(code + 1, 0) - 1
+        for char_class in char_classes:
+            for low, high in char_class.intervals:
+                events[low] = events.get(low, 0) + 1
+                events[high + 1] = events.get(high + 1, 0) - 1
+
+        self.intervals = []
+        self.labels = []
+        coverage = 0
+        boundaries = sorted(events)
+        for index, boundary in enumerate(boundaries[:-1]):
+            coverage += events[boundary]
+            if coverage > 0:
+                self.intervals.append((boundary, boundaries[index + 1] - 1))
+                self.labels.append(interval_label(boundary, boundaries[index + 1] - 1))
+
+        self._starts = [low for low, _ in self.intervals]
+        self.interval_of = dict(zip(self.labels, self.intervals))
+        self._class_atoms = {}
+        self.byte_labels = [self._search(code) for code in range(256)]
+
+    def _search(self, code):
+        index = bisect_right(self._starts, code) - 1
+        if index >= 0 and code <= self.intervals[index][1]:
+            return self.labels[index]
+        return None
+
+    def classify(self, char):
+        code = ord(char)
+        if code < 256:
+            return self.byte_labels[code]
+        return self._search(code)
+
+    def atoms_of(self, symbol):
+        if not is_class_label(symbol):
+            return [self.classify(symbol)] if len(symbol) == 1 else []
+        if symbol in self._class_atoms:
+            return self._class_atoms[symbol]
+        atoms = []
+        for low, high in CharClass(symbol).intervals:
+            index = bisect_right(self._starts, low) - 1
+            index = max(index, 0)
+            while index < len(self.intervals) and self.intervals[index][0] <= high:
+                if self.intervals[index][1] >= low:
+                    atoms.append(self.labels[index])
+                index += 1
+        self._class_atoms[symbol] = atoms
+        return atoms
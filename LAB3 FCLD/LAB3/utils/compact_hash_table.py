@@ -0,0 +1,198 @@
+from array import array
+from LAB3.utils.hash_table import FNV_OFFSET_BASIS, MASK_64, fnv1a_64, fnv1a_64_many
+
+_EMPTY = -1
+
+
+class CompactHashTable:
+    def __init__(self, size, seed=0, max_load_factor=0.75):
+        # Open addressing with linear probing over parallel preallocated arrays: per slot a hash,
+        # an offset and a length into one append-only UTF-8 arena, and an integer value. Storing
+        # a key costs a few machine words plus its bytes, with no Python object per entry.
+        if not 0 < max_load_factor < 1:
+            # probing needs an empty slot to end every run
+            raise ValueError(f"max_load_factor must be between 0 and 1 exclusive, got {max_load_factor}")
+        self.seed = seed
+        self.max_load_factor = max_load_factor
+        self.count = 0
+        self.arena = bytearray()
+        # keys are appended to the arena in insertion order, so ends[i] closes the i-th inserted key
+        self.ends = array('Q')
+        # bumped on every resize, so a position can tell whether it was taken in the current layout
+        self.generation = 0
+        self.resize_events = []
+        self._basis = FNV_OFFSET_BASIS ^ (seed & MASK_64)
+        self._allocate(self._capacity_for(size))
+
+    @staticmethod
+    def _capacity_for(size):
+        capacity = 8
+        while capacity < size:
+            capacity *= 2
+        return capacity
+
+    def _allocate(self, capacity):
+        self.size = capacity
+        self._mask = capacity - 1
+        self.hashes = array('Q', [0]) * capacity
+        self.offsets = array('Q', [0]) * capacity
+        self.lengths = array('I', [0]) * capacity
+        self.values = array('q', [_EMPTY]) * capacity
+
+    def hash_value(self, key):
+        return fnv1a_64(key.encode('utf-8'), self._basis)
+
+    def hash_values(self, keys):
+        # -> hash_value of every key, computed as one batch
+        return fnv1a_64_many([key.encode('utf-8') for key in keys], self._basis)
+
+    def hash(self, key):
+        return self.hash_value(key) & self._mask
+
+    def _probe(self, data, h):
+        # -> (slot, probe distance, found); the slot is the empty one ending the run when not found
+        mask = self._mask
+        hashes, offsets, lengths, values, arena = self.hashes, self.offsets, self.lengths, self.values, self.arena
+        length = len(data)
+        slot = h & mask
+        distance = 0
+        while values[slot] != _EMPTY:
+            if hashes[slot] == h and lengths[slot] == length:
+                offset = offsets[slot]
+                if arena[offset:offset + length] == data:
+                    return slot, distance, True
+            slot = (slot + 1) & mask
+            distance += 1
+        return slot, distance, False
+
+    def insert(self, key, value=None):
+        self.find_or_insert(key, value)
+
+    def find_or_insert(self, key, value=None, hash_value=None):
+        # -> (home slot, probe distance, inserted). Values are integers and default to the
+        # insertion index, since the slot arrays cannot hold arbitrary objects.
+        data = key.encode('utf-8')
+        h = fnv1a_64(data, self._basis) if hash_value is None else hash_value
+        slot, distance, found = self._probe(data, h)
+        if found:
+            return (slot - distance) & self._mask, distance, False
+
+        self.hashes[slot] = h
+        self.offsets[slot] = len(self.arena)
+        self.lengths[slot] = len(data)
+        self.values[slot] = self.count if value is None else value
+        self.arena += data
+        self.ends.append(len(self.arena))
+        self.count += 1
+        if self.count > self.max_load_factor * self.size:
+            self.resize(2 * self.size)
+            slot, distance, _ = self._probe(data, h)
+        return (slot - distance) & self._mask, distance, True
+
+    def resize(self, new_size):
+        # Reinserts every slot by its stored hash, so no key is rehashed and the arena is not
+        # touched. The old slot arrays are dropped; earlier positions resolve through the key's id.
+        old_hashes, old_offsets, old_lengths, old_values = self.hashes, self.offsets, self.lengths, self.values
+        capacity = self._capacity_for(new_size)
+        self.resize_events.append({"generation": self.generation, "from_size": self.size, "to_size": capacity,
+                                   "count": self.count})
+        self.generation += 1
+
+        self._allocate(capacity)
+        mask = self._mask
+        hashes, offsets, lengths, values = self.hashes, self.offsets, self.lengths, self.values
+        for old_slot, value in enumerate(old_values):
+            if value == _EMPTY:
+                continue
+            h = old_hashes[old_slot]
+            slot = h & mask
+            while values[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            hashes[slot] = h
+            offsets[slot] = old_offsets[old_slot]
+            lengths[slot] = old_lengths[old_slot]
+            values[slot] = value
+
+    def _key(self, slot):
+        offset = self.offsets[slot]
+        return self.arena[offset:offset + self.lengths[slot]].decode('utf-8')
+
+    def key_by_index(self, index):
+        start = self.ends[index - 1] if index else 0
+        return self.arena[start:self.ends[index]].decode('utf-8')
+
+    def value_at(self, first, second):
+        return self.values[(first + second) & self._mask]
+
+    def position_of(self, key, hash_value=None):
+        # -> (home slot, probe distance) or None
+        data = key.encode('utf-8')
+        h = fnv1a_64(data, self._basis) if hash_value is None else hash_value
+        slot, distance, found = self._probe(data, h)
+        if found:
+            return (slot - distance) & self._mask, distance
+        return None
+
+    def key_at(self, first, second, generation):
+        # -> key stored at (home slot, probe distance), or None; positions from an earlier generation are stale
+        mask = self._mask
+        if generation != self.generation or not 0 <= first <= mask or not 0 <= second <= mask:
+            return None
+        slot = (first + second) & mask
+        if self.values[slot] == _EMPTY:
+            return None
+        return self._key(slot)
+
+    def items(self):
+        for slot, value in enumerate(self.values):
+            if value != _EMPTY:
+                yield self._key(slot), value
+
+    def positions(self):
+        # -> (home slot, probe distance, key) in slot order
+        mask = self._mask
+        for slot, value in enumerate(self.values):
+            if value != _EMPTY:
+                home = self.hashes[slot] & mask
+                yield home, (slot - home) & mask, self._key(slot)
+
+    def stats(self):
+        # -> occupancy and collision figures computed from the current layout. Probes are slots
+        # visited: a hit at probe distance d costs d + 1, a miss costs the rest of the run from
+        # its home slot up to and including the first empty slot.
+        values, hashes, mask = self.values, self.hashes, self._mask
+        histogram = {}
+        hit_probes = 0
+        for slot, value in enumerate(values):
+            if value != _EMPTY:
+                length = ((slot - (hashes[slot] & mask)) & mask) + 1
+                histogram[length] = histogram.get(length, 0) + 1
+                hit_probes += length
+
+        # walking backwards from an empty slot, each slot's miss cost is one more than its successor's
+        empty = values.index(_EMPTY)
+        miss_probes = 0
+        run = 0
+        for step in range(self.size):
+            slot = (empty - step) & mask
+            run = 1 if values[slot] == _EMPTY else run + 1
+            miss_probes += run
+
+        return {
+            "size": self.size,
+            "count": self.count,
+            "load_factor": self.count / self.size,
+            "max_load_factor": self.max_load_factor,
+            "probe_length_histogram": dict(sorted(histogram.items())),
+            "max_probe_length": max(histogram, default=0),
+            "average_probes_hit": hit_probes / self.count if self.count else 0.0,
+            "average_probes_miss": miss_probes / self.size,
+            "arena_bytes": len(self.arena),
+            "resizes": list(self.resize_events),
+        }
+
+    def lookup(self, key):
+        return self.position_of(key) is not None
+
+    def __str__(self):
+        return str([key for key, _ in self.items()])
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import pickle
+import struct
+from LAB3.utils import char_class, deterministic_automaton, dense_automaton, finite_automata, lexer, token_table
+from LAB3.utils.finite_automata import FiniteAutomaton
+from LAB3.utils.lexer import Lexer, OPERATORS
+from LAB3.utils.token_table import TokenTable
+
+IDENTIFIER_FA_FILE = "Input_Output/identifier_fa.txt"
+CONSTANT_FA_FILE = "Input_Output/constant_fa.txt"
+CACHE_DIR_NAME = ".lexer_cache"
+
+# A cache file is a header (magic, format version and SHA-256 of the payload) followed by the
+# pickled CompiledLexer. The checksum is verified before anything is unpickled, but it only catches
+# corruption: unpickling runs code, so the cache directory must be as trusted as the source tree.
+# Never point cache_dir at a directory other users can write to.
+CACHE_MAGIC = b"LXCC"
+CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct("<4sH2x32s")
+
+# a cached artifact is only valid for the code that built it, so these sources are part of the key
+_BUILDER_MODULES = (char_class, deterministic_automaton, dense_automaton, finite_automata, lexer, token_table)
+
+# cache key -> CompiledLexer already loaded or built by this process
+_compiled = {}
+
+
+def load_tokens(token_file):
+    tokens = []
+    try:
+        with open(token_file, 'r') as file:
+            tokens = [line.strip() for line in file if line.strip()]
+    except FileNotFoundError:
+        print(f"Error: The token file '{token_file}' was not found.")
+    except Exception as e:
+        print(f"Error reading token file '{token_file}': {e}")
+    return tokens
+
+
+class CompiledLexer:
+    def __init__(self, token_file, identifier_fa_file=IDENTIFIER_FA_FILE, constant_fa_file=CONSTANT_FA_FILE):
+        # Everything a Scanner needs from the specification files: the token table, both scanner
+        # automata as DFAs and the product lexer DFA. It holds no per-scan state, so any number of
+        # Scanner instances, and worker processes, can share one.
+        self.token_file = token_file
+        self.token_list = load_tokens(token_file)
+        self.token_table = TokenTable(self.token_list, OPERATORS)
+
+        identifier_fa = FiniteAutomaton()
+        identifier_fa.parse_fa_file(identifier_fa_file)
+        self.identifier_fa = identifier_fa.determinize()
+
+        constant_fa = FiniteAutomaton()
+        constant_fa.parse_fa_file(constant_fa_file)
+        self.constant_fa = constant_fa.determinize()
+
+        self.lexer = Lexer(self.token_table, self.identifier_fa, self.constant_fa)
+
+    @staticmethod
+    def cache_key(token_file, identifier_fa_file=IDENTIFIER_FA_FILE, constant_fa_file=CONSTANT_FA_FILE):
+        # -> SHA-256 over the contents of the specification files and of the modules that compile them
+        digest = hashlib.sha256()
+        for path in (token_file, identifier_fa_file, constant_fa_file) + tuple(
+                module.__file__ for module in _BUILDER_MODULES):
+            try:
+                with open(path, 'rb') as file:
+                    content = file.read()
+            except OSError:
+                content = None
+            digest.update(b"missing" if content is None else len(content).to_bytes(8, 'little') + content)
+        return digest.hexdigest()
+
+    @staticmethod
+    def spec_key(token_file, identifier_fa_file=IDENTIFIER_FA_FILE, constant_fa_file=CONSTANT_FA_FILE):
+        # -> short hash of the specification files' absolute paths; it prefixes their cache files, so
+        # rebuilding one specification only replaces its own stale files in a shared cache directory
+        paths = "\0".join(os.path.abspath(path) for path in (token_file, identifier_fa_file, constant_fa_file))
+        return hashlib.sha256(paths.encode()).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, token_file, identifier_fa_file=IDENTIFIER_FA_FILE, constant_fa_file=CONSTANT_FA_FILE,
+             cache_dir=None):
+        # -> CompiledLexer for the files' current contents: reused from this process, else read from
+        # the on-disk cache (by default .lexer_cache next to the token file), else built and cached.
+        key = cls.cache_key(token_file, identifier_fa_file, constant_fa_file)
+        if key in _compiled:
+            return _compiled[key]
+
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(token_file)), CACHE_DIR_NAME)
+        prefix = f"{cls.spec_key(token_file, identifier_fa_file, constant_fa_file)}-"
+        cache_file = os.path.join(cache_dir, f"{prefix}{key}.pickle")
+
+        compiled = cls._read_cache(cache_file)
+        if compiled is None:
+            compiled = cls(token_file, identifier_fa_file, constant_fa_file)
+            cls._write_cache(cache_dir, cache_file, prefix, compiled)
+
+        _compiled[key] = compiled
+        return compiled
+
+    @classmethod
+    def _read_cache(cls, cache_file):
+        # -> CompiledLexer stored in the cache file, None when it is missing, from another format
+        # version, fails its checksum or cannot be unpickled; every such failure is just a cache miss
+        try:
+            with open(cache_file, 'rb') as file:
+                data = file.read()
+            magic, version, checksum = _CACHE_HEADER.unpack_from(data)
+            payload = memoryview(data)[_CACHE_HEADER.size:]
+            if magic != CACHE_MAGIC or version != CACHE_VERSION or hashlib.sha256(payload).digest() != checksum:
+                return None
+            compiled = pickle.loads(payload)
+        except Exception:
+            return None
+        return compiled if isinstance(compiled, cls) else None
+
+    @staticmethod
+    def _write_cache(cache_dir, cache_file, prefix, compiled):
+        # Stores the lexer and removes the files cached for older contents of the same specification
+        # files (same prefix), which no Scanner will ask for again; other specifications' files are kept
+        payload = pickle.dumps(compiled, protocol=pickle.HIGHEST_PROTOCOL)
+        header = _CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, hashlib.sha256(payload).digest())
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # written under a temporary name and renamed, so a concurrent reader never sees half a file
+            temporary_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temporary_file, 'wb') as file:
+                file.write(header)
+                file.write(payload)
+            os.replace(temporary_file, cache_file)
+            for name in os.listdir(cache_dir):
+                path = os.path.join(cache_dir, name)
+                if name.startswith(prefix) and name.endswith(".pickle") and path != cache_file:
+                    os.remove(path)
+        except OSError:
+            pass
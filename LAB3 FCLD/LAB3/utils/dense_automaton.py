@@ -0,0 +1,72 @@
+from array import array
+
+
+class DenseAutomaton:
+    def __init__(self, dfa):
+        # States and symbols are interned to small integers. Symbols whose columns are identical
+        # share one symbol class, and class 0 is reserved for symbols the automaton never reads.
+        # Row 0 of the table is the dead state: every class leads back to it.
+        self.state_names = [None] + sorted(dfa.states)
+        self.state_ids = {name: index for index, name in enumerate(self.state_names) if index}
+
+        columns = {}
+        for symbol in sorted(dfa.alphabet):
+            column = tuple(
+                self.state_ids.get(dfa.transitions.get(state, {}).get(symbol), 0)
+                for state in self.state_names[1:]
+            )
+            columns.setdefault(column, []).append(symbol)
+
+        self.symbol_classes = [[]] + list(columns.values())
+        self.symbol_class = {}
+        for class_id, symbols in enumerate(self.symbol_classes):
+            for symbol in symbols:
+                self.symbol_class[symbol] = class_id
+
+        self.symbol_of = dfa.symbol_of
+        self.width = len(self.symbol_classes)
+        # Targets are stored premultiplied by the row width, so a step is a single array index.
+        self.table = array('i', [0]) * (len(self.state_names) * self.width)
+        for state, state_id in self.state_ids.items():
+            for symbol, to_state in dfa.transitions.get(state, {}).items():
+                if symbol in self.symbol_class:
+                    self.table[state_id * self.width + self.symbol_class[symbol]] = self.state_ids[to_state] * self.width
+
+        self.initial_offset = self.state_ids.get(dfa.initial_state, 0) * self.width
+        self.final_offsets = frozenset(self.state_ids[state] * self.width for state in dfa.final_states
+                                       if state in self.state_ids)
+
+        # byte -> symbol class map for latin-1 input, applied in one bytes.translate call
+        self.byte_classes = None
+        if self.width <= 256:
+            self.byte_classes = bytes(self.symbol_class.get(dfa.symbol_of(chr(code)), 0) for code in range(256))
+
+    def get_states(self):
+        return set(self.state_names[1:])
+
+    def get_alphabet(self):
+        return set(self.symbol_class)
+
+    def get_initial_state(self):
+        return self.state_names[self.initial_offset // self.width]
+
+    def get_final_states(self):
+        return {self.state_names[offset // self.width] for offset in self.final_offsets}
+
+    def is_accepted(self, input_string):
+        codes = None
+        if self.byte_classes is not None:
+            try:
+                codes = input_string.encode('latin-1').translate(self.byte_classes)
+            except UnicodeEncodeError:
+                pass
+        if codes is None:
+            symbol_class = self.symbol_class
+            symbol_of = self.symbol_of
+            codes = [symbol_class.get(symbol_of(symbol), 0) for symbol in input_string]
+
+        table = self.table
+        offset = self.initial_offset
+        for code in codes:
+            offset = table[offset + code]
+        return offset in self.final_offsets
@@ -0,0 +1,205 @@
+from LAB3.utils.dense_automaton import DenseAutomaton
+
+_DEAD = object()
+
+
+class DeterministicAutomaton:
+    def __init__(self):
+        self.states = set()
+        self.alphabet = set()
+        self.transitions = {}
+        self.initial_state = None
+        self.final_states = set()
+        # DFA state name -> frozenset of NFA states it was built from (filled by determinize)
+        self.subsets = {}
+        # SymbolPartition mapping characters to class labels, None when every label is a plain symbol
+        self.partition = None
+        self._rows = None
+
+    def add_state(self, state, is_final=False):
+        self.states.add(state)
+        if is_final:
+            self.final_states.add(state)
+        self._rows = None
+
+    def add_transition(self, from_state, symbol, to_state):
+        if from_state not in self.transitions:
+            self.transitions[from_state] = {}
+        self.transitions[from_state][symbol] = to_state
+        self.alphabet.add(symbol)
+        self._rows = None
+
+    def set_initial_state(self, state):
+        self.initial_state = state
+        self._rows = None
+
+    def get_states(self):
+        return self.states
+
+    def get_alphabet(self):
+        return self.alphabet
+
+    def get_final_states(self):
+        return self.final_states
+
+    def get_initial_state(self):
+        return self.initial_state
+
+    def write_transitions(self):
+        transitions_str = ""
+        for from_state, trans in self.transitions.items():
+            for symbol, to_state in trans.items():
+                transitions_str += f"{from_state} --{symbol}--> {to_state}\n"
+        return transitions_str
+
+    def check_if_deterministic(self):
+        return True
+
+    def display(self):
+        print(f"States: {self.states}")
+        print(f"Alphabet: {self.alphabet}")
+        print(f"Initial State: {self.initial_state}")
+        print(f"Final States: {self.final_states}")
+        print("Transitions:")
+        for state, trans in self.transitions.items():
+            for symbol, to_state in trans.items():
+                print(f"  {state} --{symbol}--> {to_state}")
+
+    def _compile(self):
+        # Every state becomes a row dict whose values are the target rows themselves,
+        # so stepping through the input costs a single dict lookup per character.
+        rows = {state: {} for state in self.states}
+        for from_state, trans in self.transitions.items():
+            row = rows.setdefault(from_state, {})
+            for symbol, to_state in trans.items():
+                row[symbol] = rows.setdefault(to_state, {})
+                if self.partition is not None and symbol in self.partition.interval_of:
+                    # class labels are expanded for latin-1 so the common case stays a single lookup
+                    low, high = self.partition.interval_of[symbol]
+                    for code in range(low, min(high, 255) + 1):
+                        row[chr(code)] = row[symbol]
+        self._rows = rows
+        self._start_row = rows.get(self.initial_state)
+        self._final_rows = {id(rows[state]) for state in self.final_states if state in rows}
+
+    def is_accepted(self, input_string):
+        if self._rows is None:
+            self._compile()
+        row = self._start_row
+        if row is None:
+            return False
+        for symbol in input_string:
+            next_row = row.get(symbol)
+            if next_row is None:
+                if self.partition is None or ord(symbol) < 256:
+                    return False
+                next_row = row.get(self.partition.classify(symbol))
+                if next_row is None:
+                    return False
+            row = next_row
+        return id(row) in self._final_rows
+
+    def symbol_of(self, char):
+        if self.partition is None:
+            return char
+        return self.partition.classify(char)
+
+    def minimize(self):
+        # Hopcroft's partition refinement over the reachable part of the automaton,
+        # completed with an implicit dead state so missing transitions split correctly.
+        reachable = {self.initial_state}
+        stack = [self.initial_state]
+        while stack:
+            state = stack.pop()
+            for to_state in self.transitions.get(state, {}).values():
+                if to_state not in reachable:
+                    reachable.add(to_state)
+                    stack.append(to_state)
+
+        symbols = sorted({symbol for state in reachable for symbol in self.transitions.get(state, {})})
+        states = reachable | {_DEAD}
+
+        inverse = {symbol: {} for symbol in symbols}
+        for state in states:
+            trans = self.transitions.get(state, {}) if state is not _DEAD else {}
+            for symbol in symbols:
+                inverse[symbol].setdefault(trans.get(symbol, _DEAD), set()).add(state)
+
+        finals = {state for state in reachable if state in self.final_states}
+        partition = [block for block in (finals, states - finals) if block]
+        block_of = {}
+        for index, block in enumerate(partition):
+            for state in block:
+                block_of[state] = index
+
+        waiting = [min(range(len(partition)), key=lambda index: len(partition[index]))]
+        in_waiting = set(waiting)
+        while waiting:
+            splitter = waiting.pop()
+            in_waiting.discard(splitter)
+            splitter_states = list(partition[splitter])
+            for symbol in symbols:
+                touched = {}
+                for state in splitter_states:
+                    for predecessor in inverse[symbol].get(state, ()):
+                        touched.setdefault(block_of[predecessor], set()).add(predecessor)
+
+                for index, inside in touched.items():
+                    block = partition[index]
+                    if len(inside) == len(block):
+                        continue
+                    outside = block - inside
+                    partition[index] = inside
+                    new_index = len(partition)
+                    partition.append(outside)
+                    for state in outside:
+                        block_of[state] = new_index
+
+                    if index in in_waiting:
+                        waiting.append(new_index)
+                        in_waiting.add(new_index)
+                    else:
+                        smaller = index if len(inside) <= len(outside) else new_index
+                        waiting.append(smaller)
+                        in_waiting.add(smaller)
+
+        dead_block = block_of[_DEAD]
+        minimal = DeterministicAutomaton()
+        minimal.partition = self.partition
+        start_block = block_of[self.initial_state]
+        names = {start_block: "q0"}
+        queue = [start_block]
+
+        minimal.set_initial_state("q0")
+        while queue:
+            index = queue.pop(0)
+            name = names[index]
+            representative = next(iter(partition[index]))
+            minimal.subsets[name] = frozenset(partition[index] - {_DEAD})
+            minimal.add_state(name, is_final=representative in self.final_states)
+
+            if index == dead_block:
+                continue
+            trans = self.transitions.get(representative, {})
+            for symbol in symbols:
+                target = block_of[trans.get(symbol, _DEAD)]
+                if target == dead_block:
+                    continue
+                if target not in names:
+                    names[target] = f"q{len(names)}"
+                    queue.append(target)
+                minimal.add_transition(name, symbol, names[target])
+
+        return minimal
+
+    def to_dense(self):
+        return DenseAutomaton(self)
+
+    def write_fa_file(self, fa_file):
+        with open(fa_file, 'w') as file:
+            file.write(";".join(sorted(self.states)) + "\n")
+            file.write(f"{self.initial_state}\n")
+            file.write(";".join(sorted(self.final_states)) + "\n")
+            for from_state, trans in self.transitions.items():
+                for symbol, to_state in trans.items():
+                    file.write(f"{from_state} {symbol} {to_state}\n")
@@ -1,15 +1,39 @@
+from bisect import bisect_right
+from LAB3.utils.char_class import CharClass, SymbolPartition, is_class_label
+from LAB3.utils.deterministic_automaton import DeterministicAutomaton
+
+
 class FiniteAutomaton:
-    def __init__(self):
+    ENGINES = ("set", "bitset", "lazy")
+
+    def __init__(self, engine="set", cache_size=4096):
         self.states = set()
         self.alphabet = set()
         self.transitions = {}
         self.initial_state = None
         self.final_states = set()
+        self.char_classes = {}
+        # upper bound on the number of cached DFA states kept by the lazy engine
+        self.cache_size = cache_size
+        self.cache_flushes = 0
+        self._invalidate()
+        self.set_engine(engine)
+
+    def set_engine(self, engine):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(self.ENGINES)}")
+        self.engine = engine
+
+    def _invalidate(self):
+        self._interval_tables = None
+        self._bit_tables = None
+        self._lazy_cache = None
 
     def add_state(self, state, is_final=False):
         self.states.add(state)
         if is_final:
             self.final_states.add(state)
+        self._invalidate()
 
     def add_transition(self, from_state, symbol, to_state):
         if from_state not in self.transitions:
@@ -17,9 +41,13 @@ class FiniteAutomaton:
         if symbol not in self.transitions[from_state]:
             self.transitions[from_state][symbol] = set()
         self.transitions[from_state][symbol].add(to_state)
+        if is_class_label(symbol) and symbol not in self.char_classes:
+            self.char_classes[symbol] = CharClass(symbol)
+        self._invalidate()
 
     def set_initial_state(self, state):
         self.initial_state = state
+        self._invalidate()
 
     def get_states(self):
         return self.states
@@ -46,6 +74,17 @@ class FiniteAutomaton:
             for symbol in trans:
                 if len(trans[symbol]) > 1:
                     return False
+
+        if self.char_classes:
+            # overlapping class and literal labels leaving one state can still be nondeterministic
+            partition = self._symbol_partition()
+            for trans in self.transitions.values():
+                targets = {}
+                for symbol, to_states in trans.items():
+                    for atom in partition.atoms_of(symbol):
+                        targets.setdefault(atom, set()).update(to_states)
+                if any(len(to_states) > 1 for to_states in targets.values()):
+                    return False
         return True
 
     def display(self):
@@ -59,18 +98,207 @@ class FiniteAutomaton:
                 for to_state in to_states:
                     print(f"  {state} --{symbol}--> {to_state}")
 
+    def _symbol_partition(self):
+        literals = {symbol for trans in self.transitions.values() for symbol in trans if len(symbol) == 1}
+        return SymbolPartition(literals, self.char_classes.values())
+
+    def _build_interval_tables(self):
+        # state -> (starts, ends, targets): the state's class labels merged into sorted,
+        # disjoint code point intervals, each mapped to the union of its target states
+        self._interval_tables = {}
+        for state, trans in self.transitions.items():
+            events = {}
+            for symbol, to_states in trans.items():
+                if symbol in self.char_classes:
+                    for low, high in self.char_classes[symbol].intervals:
+                        events.setdefault(low, []).append((1, to_states))
+                        events.setdefault(high + 1, []).append((-1, to_states))
+            if not events:
+                continue
+
+            starts, ends, targets = [], [], []
+            active = []
+            boundaries = sorted(events)
+            for index, boundary in enumerate(boundaries[:-1]):
+                for delta, to_states in events[boundary]:
+                    if delta > 0:
+                        active.append(to_states)
+                    else:
+                        active.remove(to_states)
+                if active:
+                    starts.append(boundary)
+                    ends.append(boundaries[index + 1] - 1)
+                    targets.append(frozenset().union(*active))
+            self._interval_tables[state] = (starts, ends, targets)
+
+    def _class_targets(self, state, symbol):
+        starts, ends, targets = self._interval_tables[state]
+        code = ord(symbol)
+        index = bisect_right(starts, code) - 1
+        if index >= 0 and code <= ends[index]:
+            return targets[index]
+        return ()
+
     def is_accepted(self, input_string):
+        if self.engine == "bitset":
+            return self._is_accepted_bitset(input_string)
+        if self.engine == "lazy":
+            return self._is_accepted_lazy(input_string)
+        return self._is_accepted_set(input_string)
+
+    def _move(self, current_states, symbol):
+        next_states = set()
+        for state in current_states:
+            if symbol in self.transitions.get(state, {}):
+                next_states.update(self.transitions[state][symbol])
+            if state in self._interval_tables:
+                next_states.update(self._class_targets(state, symbol))
+        return next_states
+
+    def _is_accepted_set(self, input_string):
+        if self._interval_tables is None:
+            self._build_interval_tables()
         current_states = {self.initial_state}
         for symbol in input_string:
-            next_states = set()
-            for state in current_states:
-                if symbol in self.transitions.get(state, {}):
-                    next_states.update(self.transitions[state][symbol])
+            next_states = self._move(current_states, symbol)
             if not next_states:
                 return False
             current_states = next_states
         return any(state in self.final_states for state in current_states)
 
+    def _lazy_state(self, subset):
+        # cache entries are (moves, is_final, subset); moves memoizes symbol -> entry, False for dead
+        entry = self._lazy_cache.get(subset)
+        if entry is None:
+            if len(self._lazy_cache) >= self.cache_size:
+                # Like RE2, drop the whole cache when it is full instead of tracking recency per state
+                self._lazy_cache.clear()
+                self.cache_flushes += 1
+            entry = ({}, any(state in self.final_states for state in subset), subset)
+            self._lazy_cache[subset] = entry
+        return entry
+
+    def _is_accepted_lazy(self, input_string):
+        if self._lazy_cache is None:
+            if self._interval_tables is None:
+                self._build_interval_tables()
+            self._lazy_cache = {}
+            self._lazy_partition = self._symbol_partition() if self.char_classes else None
+        partition = self._lazy_partition
+
+        entry = self._lazy_state(frozenset({self.initial_state}))
+        for symbol in input_string:
+            key = partition.classify(symbol) if partition is not None else symbol
+            next_entry = entry[0].get(key)
+            if next_entry is None:
+                next_states = self._move(entry[2], symbol)
+                next_entry = self._lazy_state(frozenset(next_states)) if next_states else False
+                entry[0][key] = next_entry
+            if next_entry is False:
+                return False
+            entry = next_entry
+        return entry[1]
+
+    def _build_bit_tables(self):
+        # States are numbered so a set of active states is an int bitmask. For every symbol,
+        # chunk_tables[k][byte] is the OR of the target masks of source states 8k..8k+7 whose
+        # bits are set in byte, so one step costs a lookup per 8 states instead of a set union.
+        partition = self._symbol_partition() if self.char_classes else None
+        others = self.states | self.final_states | set(self.transitions)
+        for trans in self.transitions.values():
+            for to_states in trans.values():
+                others |= to_states
+        others.discard(self.initial_state)
+        order = [self.initial_state] + sorted(others, key=str)
+        index_of = {state: index for index, state in enumerate(order)}
+
+        masks = {}
+        for state, trans in self.transitions.items():
+            for symbol, to_states in trans.items():
+                target_mask = 0
+                for to_state in to_states:
+                    target_mask |= 1 << index_of[to_state]
+                keys = partition.atoms_of(symbol) if partition is not None else [symbol]
+                for key in keys:
+                    per_state = masks.setdefault(key, [0] * len(order))
+                    per_state[index_of[state]] |= target_mask
+
+        tables = {}
+        for key, per_state in masks.items():
+            chunk_tables = []
+            for start in range(0, len(order), 8):
+                chunk = [0] * 256
+                for byte in range(1, 256):
+                    low = byte & -byte
+                    source = start + low.bit_length() - 1
+                    chunk[byte] = chunk[byte ^ low] | (per_state[source] if source < len(order) else 0)
+                chunk_tables.append(chunk)
+            tables[key] = chunk_tables
+
+        self._bit_tables = tables
+        self._bit_partition = partition
+        self._bit_final_mask = sum(1 << index_of[state] for state in self.final_states if state in index_of)
+
+    def _is_accepted_bitset(self, input_string):
+        if self._bit_tables is None:
+            self._build_bit_tables()
+        tables = self._bit_tables
+        partition = self._bit_partition
+
+        active = 1
+        for symbol in input_string:
+            chunk_tables = tables.get(partition.classify(symbol) if partition is not None else symbol)
+            if chunk_tables is None:
+                return False
+            next_active = 0
+            for chunk in chunk_tables:
+                if not active:
+                    break
+                next_active |= chunk[active & 0xFF]
+                active >>= 8
+            if not next_active:
+                return False
+            active = next_active
+        return bool(active & self._bit_final_mask)
+
+    def determinize(self):
+        # With character classes the DFA reads disjoint atoms of the alphabet instead of raw symbols
+        partition = self._symbol_partition() if self.char_classes else None
+        dfa = DeterministicAutomaton()
+        dfa.partition = partition
+        start = frozenset({self.initial_state})
+        names = {start: "q0"}
+        queue = [start]
+
+        dfa.set_initial_state("q0")
+        while queue:
+            subset = queue.pop(0)
+            name = names[subset]
+            dfa.subsets[name] = subset
+            dfa.add_state(name, is_final=any(state in self.final_states for state in subset))
+
+            moves = {}
+            for state in sorted(subset):
+                for symbol, to_states in self.transitions.get(state, {}).items():
+                    atoms = partition.atoms_of(symbol) if partition is not None else [symbol]
+                    for atom in atoms:
+                        moves.setdefault(atom, set()).update(to_states)
+
+            for symbol in sorted(moves):
+                target = frozenset(moves[symbol])
+                if target not in names:
+                    names[target] = f"q{len(names)}"
+                    queue.append(target)
+                dfa.add_transition(name, symbol, names[target])
+
+        return dfa
+
+    def minimize(self):
+        return self.determinize().minimize()
+
+    def to_dense(self):
+        return self.minimize().to_dense()
+
     def parse_fa_file(self, fa_file):
         with open(fa_file, 'r') as file:
             lines = file.readlines()
@@ -91,6 +319,16 @@ class FiniteAutomaton:
                 self.add_transition(from_state, symbol, to_state)
                 self.alphabet.add(symbol)
 
+    def write_fa_file(self, fa_file):
+        with open(fa_file, 'w') as file:
+            file.write(";".join(sorted(self.states)) + "\n")
+            file.write(f"{self.initial_state}\n")
+            file.write(";".join(sorted(self.final_states)) + "\n")
+            for from_state, trans in self.transitions.items():
+                for symbol, to_states in trans.items():
+                    for to_state in sorted(to_states):
+                        file.write(f"{from_state} {symbol} {to_state}\n")
+
     def save_to_files(self):
         with open("states.txt", "w") as f:
             f.write("\n".join(self.states))
@@ -1,20 +1,178 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FNV_OFFSET_BASIS = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+# below this many keys the NumPy setup costs more than hashing the keys one by one
+VECTOR_MIN_BATCH = 64
+
+
+def fnv1a_64(data, basis=FNV_OFFSET_BASIS):
+    # 64-bit FNV-1a over a bytes object; a seeded table passes its own offset basis
+    h = basis
+    for byte in data:
+        h = ((h ^ byte) * FNV_PRIME) & MASK_64
+    return h
+
+
+def fnv1a_64_many(datas, basis=FNV_OFFSET_BASIS):
+    # -> [fnv1a_64(data, basis) for data in datas]. With NumPy the keys are sorted longest first
+    # and laid out as byte columns, so each FNV round is one vector operation over every key
+    # that is still long enough, instead of a Python loop per key.
+    if np is None or len(datas) < VECTOR_MIN_BATCH:
+        return [fnv1a_64(data, basis) for data in datas]
+
+    count = len(datas)
+    lengths = np.fromiter(map(len, datas), dtype=np.int64, count=count)
+    order = np.argsort(-lengths, kind='stable')
+    sorted_lengths = lengths[order]
+    width = int(sorted_lengths[0])
+
+    flat = np.frombuffer(b''.join(datas[index] for index in order), dtype=np.uint8)
+    starts = np.cumsum(sorted_lengths) - sorted_lengths
+    columns = np.zeros((width, count), dtype=np.uint8)
+    columns[np.arange(len(flat)) - np.repeat(starts, sorted_lengths),
+            np.repeat(np.arange(count), sorted_lengths)] = flat
+    # active[j] keys are longer than j, and they are the first active[j] ones in sorted order
+    active = count - np.cumsum(np.bincount(lengths, minlength=width + 1))[:width]
+
+    hashes = np.full(count, basis, dtype=np.uint64)
+    prime = np.uint64(FNV_PRIME)
+    for column, rows in zip(columns, active):
+        hashes[:rows] = (hashes[:rows] ^ column[:rows]) * prime
+
+    result = np.empty_like(hashes)
+    result[order] = hashes
+    return result.tolist()
+
+
 class HashTable:
-    def __init__(self, size):
+    def __init__(self, size, seed=0, max_load_factor=0.75):
         self.size = size
+        self.seed = seed
+        self.max_load_factor = max_load_factor
         self.table = [[] for _ in range(size)]
+        # values[bucket][index] belongs to the key stored at the same place in the table
+        self.values = [[] for _ in range(size)]
+        self.count = 0
+        # keys in insertion order, so the index-th inserted key is one list access away
+        self.keys = []
+        # bumped on every resize, so a position can tell whether it was taken in the current layout
+        self.generation = 0
+        self.resize_events = []
+        self._basis = FNV_OFFSET_BASIS ^ (seed & MASK_64)
+
+    def hash_value(self, key):
+        # FNV-1a over the UTF-8 bytes, so anagrams no longer collide; the seed perturbs the basis.
+        # Inlined rather than calling fnv1a_64, this runs once per scanned symbol.
+        h = self._basis
+        for byte in key.encode('utf-8'):
+            h = ((h ^ byte) * FNV_PRIME) & MASK_64
+        return h
+
+    def hash_values(self, keys):
+        # -> hash_value of every key, computed as one batch
+        return fnv1a_64_many([key.encode('utf-8') for key in keys], self._basis)
 
     def hash(self, key):
-        return sum(ord(c) for c in key) % self.size
+        return self.hash_value(key) % self.size
 
-    def insert(self, key):
-        index = self.hash(key)
+    def insert(self, key, value=None):
+        self.find_or_insert(key, value)
+
+    def find_or_insert(self, key, value=None, hash_value=None):
+        # -> (bucket index, index in bucket, inserted) with a single walk of the bucket.
+        # hash_value, when given, is the key's precomputed hash_value, e.g. from hash_values.
+        index = self.hash(key) if hash_value is None else hash_value % self.size
         bucket = self.table[index]
 
-        for k in bucket:
-            if k == key:
-                return
+        for position, stored in enumerate(bucket):
+            if stored == key:
+                return index, position, False
 
         bucket.append(key)
+        self.values[index].append(value)
+        self.keys.append(key)
+        self.count += 1
+        if self.count > self.max_load_factor * self.size:
+            self.resize(2 * self.size + 1)
+            index = self.hash(key)
+            return index, self.table[index].index(key), True
+        return index, len(bucket) - 1, True
+
+    def resize(self, new_size):
+        # Rehashes every key, as one batch, into a new bucket array and drops the old one. Positions
+        # handed out before the resize are resolved through the key's insertion index instead.
+        old_table, old_values = self.table, self.values
+        self.resize_events.append({"generation": self.generation, "from_size": self.size, "to_size": new_size,
+                                   "count": self.count})
+        self.generation += 1
+
+        keys = [key for bucket in old_table for key in bucket]
+        values = [value for bucket_values in old_values for value in bucket_values]
+        self.size = new_size
+        self.table = [[] for _ in range(new_size)]
+        self.values = [[] for _ in range(new_size)]
+        for key, value, hash_value in zip(keys, values, self.hash_values(keys)):
+            index = hash_value % new_size
+            self.table[index].append(key)
+            self.values[index].append(value)
+
+    def key_by_index(self, index):
+        return self.keys[index]
+
+    def value_at(self, first, second):
+        return self.values[first][second]
+
+    def position_of(self, key, hash_value=None):
+        # -> (bucket index, index in bucket) or None
+        index = self.hash(key) if hash_value is None else hash_value % self.size
+        for position, stored in enumerate(self.table[index]):
+            if stored == key:
+                return index, position
+        return None
+
+    def key_at(self, first, second, generation):
+        # -> key stored at (bucket, index), or None; positions from an earlier generation are stale
+        if generation != self.generation or not 0 <= first < self.size:
+            return None
+        bucket = self.table[first]
+        if 0 <= second < len(bucket):
+            return bucket[second]
+        return None
+
+    def items(self):
+        for bucket, values in zip(self.table, self.values):
+            yield from zip(bucket, values)
+
+    def positions(self):
+        # -> (bucket index, index in bucket, key) in table order
+        for i, bucket in enumerate(self.table):
+            for index, key in enumerate(bucket):
+                yield i, index, key
+
+    def stats(self):
+        # -> occupancy and collision figures computed from the current layout. Probes are key
+        # comparisons: a hit on the i-th key of a bucket costs i, a miss costs the whole bucket.
+        lengths = [len(bucket) for bucket in self.table]
+        histogram = {}
+        for length in lengths:
+            histogram[length] = histogram.get(length, 0) + 1
+        hit_probes = sum(length * (length + 1) // 2 for length in lengths)
+        return {
+            "size": self.size,
+            "count": self.count,
+            "load_factor": self.count / self.size,
+            "max_load_factor": self.max_load_factor,
+            "chain_length_histogram": dict(sorted(histogram.items())),
+            "max_chain_length": max(lengths, default=0),
+            "average_probes_hit": hit_probes / self.count if self.count else 0.0,
+            "average_probes_miss": self.count / self.size,
+            "resizes": list(self.resize_events),
+        }
 
     def lookup(self, key):
         index = self.hash(key)
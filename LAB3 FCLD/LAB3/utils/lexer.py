@@ -0,0 +1,160 @@
+import re
+
+ASCII = [chr(code) for code in range(128)]
+WHITESPACE = frozenset(char for char in ASCII if re.match(r'\s', char))
+WORD_CHARS = frozenset(char for char in ASCII if re.match(r'\w', char))
+DIGITS = frozenset(char for char in ASCII if re.match(r'\d', char))
+
+OPERATORS = ('+', '-', '*', '/', '%')
+MAX_STRING_LENGTH = 258
+
+# Token shapes of the Scanner's findall pattern, as a hand-built DFA:
+#   \".*?\" | \'[^\']*\' | (?<!\d)[+-]?\d+(?!\d) | \b\w+\b | !=|==|<=|>= | [+\-*/%()] | [^\s\w]
+# The two start states differ only in the sign rule: right after a digit, '+'/'-' never start a number.
+_ACCEPTING_SHAPES = {"dquote", "squote", "sign", "zero", "number", "octal", "word", "compare", "operator",
+                     "string", "char"}
+
+
+def _shape_step(shape, char):
+    if shape in ("start", "start_after_digit"):
+        if char == '"':
+            return "dquote"
+        if char == "'":
+            return "squote"
+        if char in '+-':
+            return "sign" if shape == "start" else "operator"
+        if char == '0':
+            return "zero"
+        if char in DIGITS:
+            return "number"
+        if char in WORD_CHARS:
+            return "word"
+        if char in '!=<>':
+            return "compare"
+        if char in WHITESPACE:
+            return None
+        return "operator"
+    if shape in ("dquote", "dstring"):
+        if char == '"':
+            return "string"
+        return "dstring" if char != '\n' else None
+    if shape in ("squote", "sstring"):
+        return "char" if char == "'" else "sstring"
+    if shape == "sign":
+        if char == '0':
+            return "zero"
+        return "number" if char in DIGITS else None
+    if shape in ("zero", "octal"):
+        return "octal" if char in DIGITS else None
+    if shape == "number":
+        return "number" if char in DIGITS else None
+    if shape == "word":
+        return "word" if char in WORD_CHARS else None
+    if shape == "compare":
+        return "operator" if char == '=' else None
+    return None
+
+
+class Lexer:
+    def __init__(self, token_table, identifier_fa, constant_fa):
+        # One DFA over ASCII that runs the token shapes, the TokenTable trie of token.in entries and
+        # operators, and both scanner automata in lockstep. Each accepting state already knows the
+        # PIF type the Scanner would assign, so a line is tokenized and classified in one pass.
+        self.token_table = token_table
+        self.trie = token_table.trie
+        self.trie_tags = token_table.trie_kinds
+
+        self._identifier_fa = identifier_fa
+        self._constant_fa = constant_fa
+        self._states = {}
+        self._pending = []
+        self.start = self._intern(("start", 0, identifier_fa.initial_state, constant_fa.initial_state))
+        self.start_after_digit = self._intern(
+            ("start_after_digit", 0, identifier_fa.initial_state, constant_fa.initial_state))
+
+        while self._pending:
+            key = self._pending.pop()
+            moves = self._states[key][0]
+            for char in ASCII:
+                next_key = self._step(key, char)
+                if next_key is not None:
+                    moves[char] = self._intern(next_key)
+
+    @staticmethod
+    def _fa_step(fa, state, char):
+        if state is None:
+            return None
+        return fa.transitions.get(state, {}).get(fa.symbol_of(char))
+
+    def _step(self, key, char):
+        shape, node, identifier_state, constant_state = key
+        shape = _shape_step(shape, char)
+        if shape is None:
+            return None
+        node = self.trie[node].get(char) if node is not None else None
+        return (shape, node,
+                self._fa_step(self._identifier_fa, identifier_state, char),
+                self._fa_step(self._constant_fa, constant_state, char))
+
+    def _kind(self, key):
+        shape, node, identifier_state, constant_state = key
+        if shape not in _ACCEPTING_SHAPES:
+            return None
+        if shape == "octal":
+            return "octal"
+        if node is not None and self.trie_tags[node] is not None:
+            return self.trie_tags[node]
+        if identifier_state in self._identifier_fa.final_states:
+            return "identifier"
+        if shape == "string":
+            return "string"
+        if constant_state in self._constant_fa.final_states:
+            return "int"
+        return "error"
+
+    def _intern(self, key):
+        # -> (moves, kind): moves maps a character to the (moves, kind) pair of the next state
+        if key not in self._states:
+            self._states[key] = ({}, self._kind(key))
+            self._pending.append(key)
+        return self._states[key]
+
+    def tokenize(self, line):
+        # -> list of (token, kind) where kind is keyword, operator, identifier, string, int,
+        # octal (invalid numeric literal) or error (unknown token)
+        tokens = []
+        start_moves = self.start[0]
+        after_digit_moves = self.start_after_digit[0]
+        length = len(line)
+        position = 0
+        while position < length:
+            char = line[position]
+            if char in WHITESPACE:
+                position += 1
+                continue
+            previous = line[position - 1] if position else ' '
+            if previous in WORD_CHARS and char in WORD_CHARS and char not in DIGITS:
+                # the findall pattern cannot start a word right after a number, so it skips it
+                position += 1
+                continue
+
+            moves = after_digit_moves if previous in DIGITS else start_moves
+            last_kind = None
+            last_end = position + 1
+            index = position
+            while index < length:
+                step = moves.get(line[index])
+                if step is None:
+                    break
+                moves, kind = step
+                index += 1
+                if kind is not None:
+                    last_kind = kind
+                    last_end = index
+
+            token = line[position:last_end]
+            if last_kind == "string" and len(token) > MAX_STRING_LENGTH:
+                last_kind = "int" if self._constant_fa.is_accepted(token) else "error"
+            tokens.append((token, last_kind or "error"))
+            position = last_end
+        return tokens
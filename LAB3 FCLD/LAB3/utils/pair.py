@@ -1,7 +1,11 @@
 class Pair:
-    def __init__(self, first, second):
+    def __init__(self, first, second, generation=0, term_id=None):
         self.first = first
         self.second = second
+        # hash table generation the position was taken in, see HashTable.resize
+        self.generation = generation
+        # dense id of the term, which still finds it once the position is stale
+        self.term_id = term_id
 
     def __str__(self):
         return f"({self.first}, {self.second})"
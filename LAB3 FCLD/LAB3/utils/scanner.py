@@ -1,104 +1,231 @@
+import json
+import os
 import re
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from LAB3.utils.symbol_table import SymbolTable
-from LAB3.utils.finite_automata import FiniteAutomaton
+from LAB3.utils.symbol_table_snapshot import SymbolTableSnapshot, write_snapshot
+from LAB3.utils.compiled_lexer import CompiledLexer, load_tokens
+from LAB3.utils.binary_pif import write_binary_pif
+from LAB3.utils.token_table import SYMBOL_KINDS
 
 class Scanner:
-    def __init__(self, token_file):
+    def __init__(self, token_file, symbol_table_backend="chained", compiled_lexer=None):
+        # The token table, automata and lexer come from a CompiledLexer shared by every Scanner
+        # for the same specification files, so only the first one pays for building it
         self.token_file = token_file
-        self.token_list = self.load_tokens(token_file)
-        self.pif = []
-        self.errors = []
-        self.symbol_table = SymbolTable(size=250)
-        self.index_counter = 0
-        self.unique_values = {}
+        self.symbol_table_backend = symbol_table_backend
+        self.reset()
 
-        self.identifier_fa = FiniteAutomaton()
-        self.identifier_fa.parse_fa_file("Input_Output/identifier_fa.txt")
+        self.compiled_lexer = compiled_lexer or CompiledLexer.load(token_file)
+        self.token_list = self.compiled_lexer.token_list
+        self.token_table = self.compiled_lexer.token_table
+        self.identifier_fa = self.compiled_lexer.identifier_fa
+        self.constant_fa = self.compiled_lexer.constant_fa
+        self.lexer = self.compiled_lexer.lexer
 
-        self.constant_fa = FiniteAutomaton()
-        self.constant_fa.parse_fa_file("Input_Output/constant_fa.txt")
+    def reset(self):
+        self.pif = []
+        self.errors = []
+        self.symbol_table = SymbolTable(size=250, backend=self.symbol_table_backend)
 
     def load_tokens(self, token_file):
-        tokens = []
-        try:
-            with open(token_file, 'r') as file:
-                tokens = [line.strip() for line in file if line.strip()]
-        except FileNotFoundError:
-            print(f"Error: The token file '{token_file}' was not found.")
-        except Exception as e:
-            print(f"Error reading token file '{token_file}': {e}")
-        return tokens
+        return load_tokens(token_file)
 
     def is_string_constant(self, token):
         string_pattern = r'^".{0,256}"$'
         return re.match(string_pattern, token) is not None
 
     def scan(self, program_file):
-        with open(program_file, 'r') as f:
-            for line_num, line in enumerate(f, start=1):
-                self.scan_line(line.strip(), line_num)
+        self.pif.extend(self.iter_tokens(program_file))
+        return self.report_errors()
 
+    def report_errors(self):
         if self.errors:
             for error in self.errors:
                 print(error)
             return False
         return True
 
+    def iter_tokens(self, program_file):
+        # Yields PIF entries as the file is read, so memory does not grow with the program size.
+        # Lexical errors are still collected in self.errors.
+        with open(program_file, 'r') as f:
+            for line_num, line in enumerate(f, start=1):
+                yield from self.tokens_of_line(line.strip(), line_num)
+
+    def scan_many(self, paths, workers=None, chunk_lines=None):
+        # Scans the files in worker processes, optionally cutting each file into chunks of
+        # chunk_lines lines. Results are merged in input order, so symbol positions, the PIF
+        # and the symbol table come out exactly as if the files were scanned one after another.
+        workers = workers or os.cpu_count() or 1
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.compiled_lexer, self.symbol_table_backend)) as pool:
+            for task in self._scan_tasks(paths, chunk_lines):
+                pending.append((task[0], pool.submit(_scan_task, task)))
+                # keep a bounded number of chunks in flight so large files are never fully loaded
+                if len(pending) >= 2 * workers:
+                    path, future = pending.popleft()
+                    self.merge_result(*future.result(), program_file=path)
+            while pending:
+                path, future = pending.popleft()
+                self.merge_result(*future.result(), program_file=path)
+        return self.report_errors()
+
+    @staticmethod
+    def _scan_tasks(paths, chunk_lines):
+        for path in paths:
+            if chunk_lines is None:
+                yield path, 1, None
+                continue
+            with open(path, 'r') as f:
+                first_line = 1
+                lines = []
+                for line in f:
+                    lines.append(line)
+                    if len(lines) == chunk_lines:
+                        yield path, first_line, lines
+                        first_line += len(lines)
+                        lines = []
+                if lines:
+                    yield path, first_line, lines
+
+    def scan_task(self, program_file, first_line, lines):
+        # -> (pif, terms, errors) with PIF positions local to this task and terms listed by
+        # symbol table id, i.e. in the order they were first seen, which is all merge_result
+        # needs to renumber them
+        self.reset()
+        if lines is None:
+            self.pif.extend(self.iter_tokens(program_file))
+        else:
+            for line_num, line in enumerate(lines, start=first_line):
+                self.pif.extend(self.tokens_of_line(line.strip(), line_num))
+        return self.pif, self.symbol_table.terms(), self.errors
+
+    def merge_result(self, pif, terms, errors, program_file=None):
+        # errors are prefixed with the file they come from, so merged results still tell files apart
+        positions = self.symbol_table.add_many(terms)
+        self.pif.extend((token, positions[pos] if pos != -1 else -1, token_type) for token, pos, token_type in pif)
+        if program_file is None:
+            self.errors.extend(errors)
+        else:
+            self.errors.extend(f"{program_file}: {error}" for error in errors)
+
     def scan_line(self, line, line_num):
-        tokens = re.findall(
+        self.pif.extend(self.tokens_of_line(line, line_num))
+
+    def tokens_of_line(self, line, line_num):
+        # The lexer DFA covers ASCII; other lines go through the original regex split
+        if line.isascii():
+            tokens = self.lexer.tokenize(line)
+        else:
+            tokens = [(token, self.classify_token(token)) for token in self.split_line(line)]
+
+        entries = []
+        for token, kind in tokens:
+            entry = self.pif_entry(token, kind, line_num)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def split_line(self, line):
+        return re.findall(
             r'\".*?\"|\'[^\']*\'|(?<!\d)[+-]?\d+(?!\d)|\b\w+\b|!=|==|<=|>=|[+\-*/%()]|[^\s\w]', line
         )
 
-        for token in tokens:
-            if re.match(r'^0\d+|[-+]?0\d+', token):
-                self.errors.append(f"Lexical error at line {line_num}: invalid numeric literal '{token}'")
-                continue
+    def classify_token(self, token):
+        if re.match(r'^0\d+|[-+]?0\d+', token):
+            return "octal"
+        kind = self.token_table.kind_of(token)
+        if kind is not None:
+            return kind
+        if self.identifier_fa.is_accepted(token):
+            return "identifier"
+        if self.is_string_constant(token):
+            return "string"
+        if self.constant_fa.is_accepted(token):
+            return "int"
+        return "error"
+
+    def pif_entry(self, token, kind, line_num):
+        if kind == "octal":
+            self.errors.append(f"Lexical error at line {line_num}: invalid numeric literal '{token}'")
+            return None
+        if kind == "error":
+            self.errors.append(f"Lexical error at line {line_num}: unknown token '{token}'")
+            return None
+        if kind in ("keyword", "operator"):
+            return token, -1, kind
+        return token, self.intern_symbol(token), kind
+
+    def intern_symbol(self, token):
+        # PIF positions are the symbol table's own ids, found or assigned with one bucket walk
+        return self.symbol_table.intern(token)
+
+    def write_pif_stream(self, program_file, pif_file='PIF.out', flush_every=1000):
+        # Scans and writes PIF lines as they are produced, flushing every flush_every source lines
+        # so a consumer reading the file can follow along before the scan finishes
+        with open(program_file, 'r') as source, open(pif_file, 'w') as out:
+            for line_num, line in enumerate(source, start=1):
+                for token, pos, token_type in self.tokens_of_line(line.strip(), line_num):
+                    out.write(f"{token} {pos} {token_type}\n")
+                if line_num % flush_every == 0:
+                    out.flush()
+        return self.report_errors()
+
+    def write_binary_pif(self, program_file, pif_file='PIF.bin'):
+        # Scans the file into three fixed-width columns (token code, symbol table id, line number)
+        # and writes them with the token name table in one binary file
+        token_table = self.token_table
+        symbol_codes = {kind: token_table.symbol_code(kind) for kind in SYMBOL_KINDS}
+        codes, positions, lines = array('I'), array('i'), array('I')
+        with open(program_file, 'r') as source:
+            for line_num, line in enumerate(source, start=1):
+                for token, pos, token_type in self.tokens_of_line(line.strip(), line_num):
+                    code = symbol_codes.get(token_type)
+                    codes.append(token_table.code_of(token) if code is None else code)
+                    positions.append(pos)
+                    lines.append(line_num)
+        write_binary_pif(pif_file, token_table.names, codes, positions, lines)
+        return self.report_errors()
+
+    def write_outputs(self, stats_file=None):
+        with open('PIF.out', 'w') as pif_file:
+            for token, pos, token_type in self.pif:
+                pif_file.write(f"{token} {pos} {token_type}\n")
 
-            if token in self.token_list:
-                self.pif.append((token, -1, "keyword"))
-                continue
+        self.write_symbol_table()
+        self.write_symbol_table_snapshot()
+        if stats_file is not None:
+            self.write_symbol_table_stats(stats_file)
 
-            if token in ('+', '-', '*', '/', '%'):
-                self.pif.append((token, -1, "operator"))
-                continue
+    def write_symbol_table(self, st_file='ST.out'):
+        with open(st_file, 'w') as file:
+            file.write(str(self.symbol_table))
 
-            if self.identifier_fa.is_accepted(token):
-                if token not in self.unique_values:
-                    self.unique_values[token] = self.index_counter
-                    self.index_counter += 1
-                pos = self.unique_values[token]
-                self.pif.append((token, pos, "identifier"))
+    def write_symbol_table_snapshot(self, snapshot_file='ST.bin'):
+        write_snapshot(self.symbol_table, snapshot_file)
 
-                if not self.symbol_table.contains_term(token):
-                    self.symbol_table.add(token)
+    def write_symbol_table_stats(self, stats_file='ST.stats.json'):
+        # Occupancy, collision and resize figures of the symbol table, e.g. to spot a bad hash
+        with open(stats_file, 'w') as file:
+            json.dump(self.symbol_table.stats(), file, indent=2)
 
-            elif self.is_string_constant(token):
-                if token not in self.unique_values:
-                    self.unique_values[token] = self.index_counter
-                    self.index_counter += 1
-                pos = self.unique_values[token]
-                self.pif.append((token, pos, "string"))
+    def load_symbol_table(self, snapshot_file='ST.bin'):
+        # Continues from a table saved by an earlier run: known symbols keep their ids
+        with SymbolTableSnapshot(snapshot_file) as snapshot:
+            self.symbol_table = snapshot.to_symbol_table(self.symbol_table_backend)
 
-                if not self.symbol_table.contains_term(token):
-                    self.symbol_table.add(token)
 
-            elif self.constant_fa.is_accepted(token):
-                if token not in self.unique_values:
-                    self.unique_values[token] = self.index_counter
-                    self.index_counter += 1
-                pos = self.unique_values[token]
-                self.pif.append((token, pos, "int"))
+_worker_scanner = None
 
-                if not self.symbol_table.contains_term(token):
-                    self.symbol_table.add(token)
 
-            else:
-                self.errors.append(f"Lexical error at line {line_num}: unknown token '{token}'")
+def _init_worker(compiled_lexer, symbol_table_backend):
+    global _worker_scanner
+    _worker_scanner = Scanner(compiled_lexer.token_file, symbol_table_backend, compiled_lexer)
 
-    def write_outputs(self):
-        with open('PIF.out', 'w') as pif_file:
-            for token, pos, token_type in self.pif:
-                pif_file.write(f"{token} {pos} {token_type}\n")
 
-        with open('ST.out', 'w') as st_file:
-            st_file.write(str(self.symbol_table))
+def _scan_task(task):
+    return _worker_scanner.scan_task(*task)
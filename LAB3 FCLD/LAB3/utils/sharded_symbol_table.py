@@ -0,0 +1,89 @@
+import threading
+from LAB3.utils.hash_table import FNV_OFFSET_BASIS, MASK_64, fnv1a_64
+from LAB3.utils.symbol_table import SymbolTable
+
+# murmur3 fmix64 constants; FNV leaves the high bits of short keys poorly mixed
+_MIX_1 = 0xff51afd7ed558ccd
+_MIX_2 = 0xc4ceb9fe1a85ec53
+
+class ShardedSymbolTable:
+    def __init__(self, shards=16, size=100, seed=0, backend="chained"):
+        # N independent symbol tables, each behind its own lock. A term always lands in the
+        # shard picked by the high bits of its hash, so threads interning different terms
+        # mostly take different locks, and contention drops as the shard count grows.
+        if shards < 1:
+            raise ValueError(f"Invalid shard count {shards}, expected at least 1")
+        self.shard_count = shards
+        self.shards = [SymbolTable(size=max(1, size // shards), seed=seed, backend=backend) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+        self._basis = FNV_OFFSET_BASIS ^ (seed & MASK_64)
+
+    def _locate(self, term):
+        # -> (shard index, hash value). The hash is finalized with fmix64 and multiply-shift maps
+        # the result to a shard by its high bits; the shard's own table gets the plain hash.
+        hash_value = fnv1a_64(term.encode('utf-8'), self._basis)
+        mixed = hash_value ^ (hash_value >> 33)
+        mixed = (mixed * _MIX_1) & MASK_64
+        mixed ^= mixed >> 33
+        mixed = (mixed * _MIX_2) & MASK_64
+        mixed ^= mixed >> 33
+        return (mixed * self.shard_count) >> 64, hash_value
+
+    def get_or_add(self, term):
+        # -> stable id of the term, local id * shard count + shard, atomic across threads
+        shard, hash_value = self._locate(term)
+        table = self.shards[shard].table
+        with self.locks[shard]:
+            first, second, _ = table.find_or_insert(term, table.count, hash_value)
+            local_id = table.value_at(first, second)
+        return local_id * self.shard_count + shard
+
+    def add(self, term):
+        self.get_or_add(term)
+
+    def id_of(self, term):
+        # -> id of the term, or None when it is not in the table; never inserts
+        shard, hash_value = self._locate(term)
+        table = self.shards[shard].table
+        with self.locks[shard]:
+            position = table.position_of(term, hash_value)
+            if position is None:
+                return None
+            local_id = table.value_at(*position)
+        return local_id * self.shard_count + shard
+
+    def term_by_id(self, term_id):
+        if term_id < 0:
+            return None
+        shard = term_id % self.shard_count
+        with self.locks[shard]:
+            return self.shards[shard].term_by_id(term_id // self.shard_count)
+
+    def contains_term(self, term):
+        return self.id_of(term) is not None
+
+    @property
+    def count(self):
+        return sum(shard.count for shard in self.shards)
+
+    def stats(self):
+        shards = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shards.append(shard.stats())
+        return {"shard_count": self.shard_count, "count": sum(stats["count"] for stats in shards), "shards": shards}
+
+    def terms(self):
+        # -> every term, shard by shard in insertion order
+        output = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                output.extend(shard.terms())
+        return output
+
+    def __str__(self):
+        output = []
+        for index, shard in enumerate(self.shards):
+            for term_id, term in enumerate(shard.terms()):
+                output.append(f"{term} (Id: {term_id * self.shard_count + index}, Shard: {index})")
+        return '\n'.join(output)
@@ -1,9 +1,20 @@
+from array import array
 from LAB3.utils.hash_table import HashTable
+from LAB3.utils.compact_hash_table import CompactHashTable
 from LAB3.utils.pair import Pair
 
+# "chained" keeps a Python list per bucket, "compact" uses open addressing over flat arrays
+BACKENDS = {"chained": HashTable, "compact": CompactHashTable}
+
 class SymbolTable:
-    def __init__(self, size=100):
-        self.table = HashTable(size)
+    def __init__(self, size=100, seed=0, backend="chained"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown symbol table backend '{backend}', expected one of {', '.join(BACKENDS)}")
+        self.backend = backend
+        # Every term gets a dense id in insertion order. The id is kept as the term's value in the
+        # table, so it survives resizes, and the backend keeps its keys by insertion index as well,
+        # so going from an id back to the term is a single array access.
+        self.table = BACKENDS[backend](size, seed=seed)
 
     def get_bucket(self, index):
         return self.table[index]
@@ -11,39 +22,95 @@ class SymbolTable:
     def get_size(self):
         return self.table.size
 
-    def find_position_of_term(self, term):
-        hash_value = self.table.hash(term)
-        bucket = self.table.table[hash_value]
+    @property
+    def count(self):
+        return self.table.count
 
-        if not bucket:
+    def find_position_of_term(self, term):
+        position = self.table.position_of(term)
+        if position is None:
             return None
-
-        for index, key in enumerate(bucket):
-            if key == term:
-                return Pair(hash_value, index)
-
-        return None
+        return Pair(position[0], position[1], self.table.generation, self.table.value_at(*position))
 
     def find_by_pos(self, pos):
+        # positions from before a resize are resolved through the term's id, the old layout is gone
         if pos is None:
             return None
+        if pos.generation == self.table.generation:
+            return self.table.key_at(pos.first, pos.second, pos.generation)
+        if pos.term_id is None:
+            return None
+        return self.term_by_id(pos.term_id)
+
+    def migrate_position(self, pos):
+        # -> Pair valid in the current layout for a Pair taken in any earlier one
+        if pos is None or pos.generation == self.table.generation:
+            return pos
+        term = self.find_by_pos(pos)
+        if term is None:
+            return None
+        return self.find_position_of_term(term)
 
-        bucket = self.table.table[pos.first]
-        if 0 <= pos.second < len(bucket):
-            return bucket[pos.second]
-        return None
+    def term_by_id(self, term_id):
+        if not 0 <= term_id < self.count:
+            return None
+        return self.table.key_by_index(term_id)
+
+    def id_of(self, term):
+        # -> id of the term, or None when it is not in the table; never inserts
+        position = self.table.position_of(term)
+        if position is None:
+            return None
+        return self.table.value_at(*position)
 
     def contains_term(self, term):
         return self.table.lookup(term)
 
     def add(self, term):
-        if not self.contains_term(term):
-            self.table.insert(term)
+        self.intern(term)
+
+    def intern(self, term):
+        # -> stable id of the term, assigned in insertion order, found or added with one bucket walk
+        first, second, _ = self.table.find_or_insert(term, self.table.count)
+        return self.table.value_at(first, second)
+
+    def intern_with_position(self, term):
+        # -> (id, Pair(first, second)) from the same single walk
+        first, second, _ = self.table.find_or_insert(term, self.table.count)
+        term_id = self.table.value_at(first, second)
+        return term_id, Pair(first, second, self.table.generation, term_id)
+
+    def add_many(self, terms):
+        # -> array of the terms' ids. All keys are hashed in one batch (vectorized when NumPy is
+        # available), then each is found or inserted with a single walk.
+        terms = list(terms)
+        table = self.table
+        ids = array('q')
+        for term, hash_value in zip(terms, table.hash_values(terms)):
+            first, second, _ = table.find_or_insert(term, table.count, hash_value)
+            ids.append(table.value_at(first, second))
+        return ids
+
+    def lookup_many(self, terms):
+        # -> array of the terms' ids, -1 for terms not in the table; never inserts
+        terms = list(terms)
+        table = self.table
+        ids = array('q')
+        for term, hash_value in zip(terms, table.hash_values(terms)):
+            position = table.position_of(term, hash_value)
+            ids.append(-1 if position is None else table.value_at(*position))
+        return ids
+
+    def stats(self):
+        stats = {"backend": self.backend}
+        stats.update(self.table.stats())
+        return stats
+
+    def terms(self):
+        return [self.table.key_by_index(term_id) for term_id in range(self.count)]
 
     def __str__(self):
         output = []
-        for i, bucket in enumerate(self.table.table):
-            if bucket:
-                for index, term in enumerate(bucket):
-                    output.append(f"{term} (Position: {i}, Index: {index})")
+        for first, second, term in self.table.positions():
+            output.append(f"{term} (Position: {first}, Index: {second})")
         return '\n'.join(output)
@@ -0,0 +1,133 @@
+import mmap
+import struct
+import sys
+from array import array
+from LAB3.utils.hash_table import FNV_OFFSET_BASIS, MASK_64, fnv1a_64
+from LAB3.utils.symbol_table import SymbolTable
+
+# Layout, every section starting on an 8-byte boundary:
+#   header   magic, version, byte order, term count, index slot count, seed, arena size
+#   index    slot_count uint32 slots holding id + 1 (0 = empty), open addressing with linear probing
+#   ends     count uint64, ends[i] is the arena offset just past term i
+#   hashes   count uint64, the FNV-1a hash of every term, checked before comparing bytes
+#   arena    the UTF-8 bytes of all terms in id order
+MAGIC = b"LSTB"
+VERSION = 1
+_HEADER = struct.Struct("<4sHBxQQQQ")
+_LITTLE, _BIG = 0, 1
+
+
+def _padded(data):
+    return data + bytes(-len(data) % 8)
+
+
+def write_snapshot(symbol_table, path):
+    # Builds the whole file in memory and writes it with a single call
+    terms = symbol_table.terms()
+    seed = symbol_table.table.seed
+
+    encoded = [term.encode('utf-8') for term in terms]
+    hashes = array('Q', symbol_table.table.hash_values(terms))
+    ends = array('Q')
+    arena_size = 0
+    for data in encoded:
+        arena_size += len(data)
+        ends.append(arena_size)
+
+    slot_count = 8
+    while slot_count < 2 * len(terms):
+        slot_count *= 2
+    mask = slot_count - 1
+    index = array('I', [0]) * slot_count
+    for term_id, hash_value in enumerate(hashes):
+        slot = hash_value & mask
+        while index[slot]:
+            slot = (slot + 1) & mask
+        index[slot] = term_id + 1
+
+    byte_order = _LITTLE if sys.byteorder == "little" else _BIG
+    header = _HEADER.pack(MAGIC, VERSION, byte_order, len(terms), slot_count, seed & MASK_64, arena_size)
+    with open(path, 'wb') as file:
+        file.write(b"".join((_padded(header), _padded(index.tobytes()), ends.tobytes(), hashes.tobytes(),
+                             b"".join(encoded))))
+
+
+class SymbolTableSnapshot:
+    def __init__(self, path):
+        # Maps the file read-only; lookups read the index and arena in place, nothing is copied
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = view = memoryview(self._mmap)
+
+        if len(view) < _HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not a symbol table snapshot")
+        magic, version, byte_order, count, slot_count, seed, arena_size = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a version {VERSION} symbol table snapshot")
+        if byte_order != (_LITTLE if sys.byteorder == "little" else _BIG):
+            self.close()
+            raise ValueError(f"'{path}' was written on a machine with a different byte order")
+
+        self.count = count
+        self.seed = seed
+        self._basis = FNV_OFFSET_BASIS ^ seed
+        self._mask = slot_count - 1
+
+        offset = len(_padded(bytes(_HEADER.size)))
+        index_size = len(_padded(bytes(4 * slot_count)))
+        self._index = view[offset:offset + 4 * slot_count].cast('I')
+        offset += index_size
+        self._ends = view[offset:offset + 8 * count].cast('Q')
+        offset += 8 * count
+        self._hashes = view[offset:offset + 8 * count].cast('Q')
+        offset += 8 * count
+        self._arena = view[offset:offset + arena_size]
+
+    def _slice(self, term_id):
+        start = self._ends[term_id - 1] if term_id else 0
+        return self._arena[start:self._ends[term_id]]
+
+    def id_of(self, term):
+        # -> id of the term, or None when it is not in the snapshot
+        data = term.encode('utf-8')
+        hash_value = fnv1a_64(data, self._basis)
+        index, hashes, mask = self._index, self._hashes, self._mask
+        slot = hash_value & mask
+        while index[slot]:
+            term_id = index[slot] - 1
+            if hashes[term_id] == hash_value and self._slice(term_id) == data:
+                return term_id
+            slot = (slot + 1) & mask
+        return None
+
+    def term_by_id(self, term_id):
+        if not 0 <= term_id < self.count:
+            return None
+        return str(self._slice(term_id), 'utf-8')
+
+    def contains_term(self, term):
+        return self.id_of(term) is not None
+
+    def terms(self):
+        return [self.term_by_id(term_id) for term_id in range(self.count)]
+
+    def to_symbol_table(self, backend="chained"):
+        # -> a live SymbolTable with the same ids, sized so loading it never triggers a resize
+        symbol_table = SymbolTable(size=max(100, int(self.count / 0.75) + 1), seed=self.seed, backend=backend)
+        symbol_table.add_many(self.terms())
+        return symbol_table
+
+    def close(self):
+        for name in ("_index", "_ends", "_hashes", "_arena", "_view"):
+            if hasattr(self, name):
+                getattr(self, name).release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,54 @@
+# Codes 0..2 belong to the PIF entries that point into the symbol table, one per kind, named
+# '<kind>' so the name can never clash with a keyword such as 'int'. Every entry of token.in and
+# then every remaining operator follows with a code of its own, in file order.
+SYMBOL_KINDS = ("identifier", "int", "string")
+
+
+def kind_name(kind):
+    return f"<{kind}>"
+
+
+class TokenTable:
+    def __init__(self, token_list, operators):
+        # token.in compiled once: a name per code, a dict from token to code and kind for direct
+        # lookups, and a trie over the same tokens whose nodes carry the kind, so an automaton
+        # walking the trie (see Lexer) knows a token the moment it reads its last character
+        self.names = [kind_name(kind) for kind in SYMBOL_KINDS]
+        self.codes = {}
+        self.kinds = {}
+        self.trie = [{}]
+        self.trie_kinds = [None]
+        # a token listed in token.in is a keyword even when it is also an operator
+        for token in token_list:
+            self._add(token, "keyword")
+        for token in operators:
+            self._add(token, "operator")
+
+    def _add(self, token, kind):
+        if token in self.codes:
+            return
+        code = len(self.names)
+        self.names.append(token)
+        self.codes[token] = code
+        self.kinds[token] = kind
+
+        node = 0
+        for char in token:
+            if char not in self.trie[node]:
+                self.trie[node][char] = len(self.trie)
+                self.trie.append({})
+                self.trie_kinds.append(None)
+            node = self.trie[node][char]
+        self.trie_kinds[node] = kind
+
+    def code_of(self, token):
+        # -> code of a keyword or operator, None for any other token
+        return self.codes.get(token)
+
+    def kind_of(self, token):
+        # -> "keyword", "operator" or None
+        return self.kinds.get(token)
+
+    def symbol_code(self, kind):
+        # -> the shared code of every identifier, int or string entry
+        return SYMBOL_KINDS.index(kind)
@@ -10,6 +10,7 @@ def print_menu():
     print("5. Print initial state.")
     print("6. Print is deterministic.")
     print("7. Check if sequence is accepted by DFA.")
+    print("8. Minimize FA and write it to file.")
     print("0. Exit.")
 
 
@@ -19,6 +20,8 @@ def options_for_dfa():
 
     # Get the FA file and parse it
     fa_file = "Input_Output/FA.in"
+    # the minimized FA goes to its own file unless the user names another, so FA.in is never overwritten
+    minimized_fa_file = "Input_Output/FA_minimized.in"
 
     if not os.path.exists(fa_file):
         print(f"Error: The FA file '{fa_file}' does not exist.")
@@ -81,6 +84,15 @@ def options_for_dfa():
             print()
             print_menu()
 
+        elif option == '8':
+            output_file = input(f"Enter the output file (leave empty for '{minimized_fa_file}'): ").strip() \
+                or minimized_fa_file
+            minimal_fa = fa.minimize()
+            minimal_fa.write_fa_file(output_file)
+            print(f"Minimized FA with {len(minimal_fa.get_states())} states written to '{output_file}'.")
+            print()
+            print_menu()
+
         elif option == '0':
             break
 
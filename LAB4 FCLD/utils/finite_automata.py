@@ -1,7 +1,12 @@
+_DEAD = object()
+
+
 class FiniteAutomaton:
     def __init__(self):
         self.states = set()
         self.alphabet = set()
+        # state -> symbol -> set of target states: the automaton may be nondeterministic, is_accepted
+        # follows every target and check_if_deterministic reports whether any symbol has more than one
         self.transitions = {}
         self.initial_state = None
         self.final_states = set()
@@ -14,7 +19,10 @@ class FiniteAutomaton:
     def add_transition(self, from_state, symbol, to_state):
         if from_state not in self.transitions:
             self.transitions[from_state] = {}
-        self.transitions[from_state][symbol] = to_state
+        # every target is kept, so a nondeterministic FA file is read without losing transitions
+        if symbol not in self.transitions[from_state]:
+            self.transitions[from_state][symbol] = set()
+        self.transitions[from_state][symbol].add(to_state)
 
     def set_initial_state(self, state):
         self.initial_state = state
@@ -34,14 +42,16 @@ class FiniteAutomaton:
     def write_transitions(self):
         transitions_str = ""
         for from_state, trans in self.transitions.items():
-            for symbol, to_state in trans.items():
-                transitions_str += f"{from_state} --{symbol}--> {to_state}\n"
+            for symbol, to_states in trans.items():
+                for to_state in to_states:
+                    transitions_str += f"{from_state} --{symbol}--> {to_state}\n"
         return transitions_str
 
     def check_if_deterministic(self):
         for state, trans in self.transitions.items():
-            if len(trans) != len(set(trans.values())):
-                return False
+            for symbol in trans:
+                if len(trans[symbol]) > 1:
+                    return False
         return True
 
     def display(self):
@@ -51,8 +61,9 @@ class FiniteAutomaton:
         print(f"Final States: {self.final_states}")
         print("Transitions:")
         for state, trans in self.transitions.items():
-            for symbol, to_state in trans.items():
-                print(f"  {state} --{symbol}--> {to_state}")
+            for symbol, to_states in trans.items():
+                for to_state in to_states:
+                    print(f"  {state} --{symbol}--> {to_state}")
 
 
 
@@ -80,9 +91,130 @@ class FiniteAutomaton:
                 self.alphabet.add(symbol)
 
     def is_accepted(self, input_string):
-        current_state = self.initial_state
+        current_states = {self.initial_state}
         for symbol in input_string:
-            if symbol not in self.transitions.get(current_state, {}):
+            next_states = set()
+            for state in current_states:
+                next_states.update(self.transitions.get(state, {}).get(symbol, ()))
+            if not next_states:
                 return False
-            current_state = self.transitions[current_state][symbol]
-        return current_state in self.final_states
\ No newline at end of file
+            current_states = next_states
+        return any(state in self.final_states for state in current_states)
+
+    def determinize(self):
+        # Subset construction over the reachable sets of states; every DFA state has at most one
+        # target per symbol, so its transition sets hold a single state
+        start = frozenset({self.initial_state})
+        names = {start: "q0"}
+        queue = [start]
+        dfa = FiniteAutomaton()
+        dfa.set_initial_state("q0")
+        while queue:
+            subset = queue.pop(0)
+            name = names[subset]
+            dfa.add_state(name, is_final=any(state in self.final_states for state in subset))
+
+            moves = {}
+            for state in sorted(subset):
+                for symbol, to_states in self.transitions.get(state, {}).items():
+                    moves.setdefault(symbol, set()).update(to_states)
+
+            for symbol in sorted(moves):
+                target = frozenset(moves[symbol])
+                if target not in names:
+                    names[target] = f"q{len(names)}"
+                    queue.append(target)
+                dfa.add_transition(name, symbol, names[target])
+                dfa.alphabet.add(symbol)
+        return dfa
+
+    def minimize(self):
+        # Hopcroft's partition refinement over the determinized automaton, completed with an
+        # implicit dead state so missing transitions split correctly
+        dfa = self.determinize()
+        target_of = {state: {symbol: next(iter(to_states)) for symbol, to_states in trans.items()}
+                     for state, trans in dfa.transitions.items()}
+        symbols = sorted(dfa.alphabet)
+        states = dfa.states | {_DEAD}
+
+        inverse = {symbol: {} for symbol in symbols}
+        for state in states:
+            trans = target_of.get(state, {})
+            for symbol in symbols:
+                inverse[symbol].setdefault(trans.get(symbol, _DEAD), set()).add(state)
+
+        finals = set(dfa.final_states)
+        partition = [block for block in (finals, states - finals) if block]
+        block_of = {}
+        for index, block in enumerate(partition):
+            for state in block:
+                block_of[state] = index
+
+        waiting = [min(range(len(partition)), key=lambda index: len(partition[index]))]
+        in_waiting = set(waiting)
+        while waiting:
+            splitter = waiting.pop()
+            in_waiting.discard(splitter)
+            splitter_states = list(partition[splitter])
+            for symbol in symbols:
+                touched = {}
+                for state in splitter_states:
+                    for predecessor in inverse[symbol].get(state, ()):
+                        touched.setdefault(block_of[predecessor], set()).add(predecessor)
+
+                for index, inside in touched.items():
+                    block = partition[index]
+                    if len(inside) == len(block):
+                        continue
+                    outside = block - inside
+                    partition[index] = inside
+                    new_index = len(partition)
+                    partition.append(outside)
+                    for state in outside:
+                        block_of[state] = new_index
+
+                    if index in in_waiting:
+                        waiting.append(new_index)
+                        in_waiting.add(new_index)
+                    else:
+                        smaller = index if len(inside) <= len(outside) else new_index
+                        waiting.append(smaller)
+                        in_waiting.add(smaller)
+
+        dead_block = block_of[_DEAD]
+        minimal = FiniteAutomaton()
+        start_block = block_of[dfa.initial_state]
+        names = {start_block: "q0"}
+        queue = [start_block]
+
+        minimal.set_initial_state("q0")
+        while queue:
+            index = queue.pop(0)
+            name = names[index]
+            representative = next(iter(partition[index]))
+            minimal.add_state(name, is_final=representative in dfa.final_states)
+
+            if index == dead_block:
+                continue
+            trans = target_of.get(representative, {})
+            for symbol in symbols:
+                target = block_of[trans.get(symbol, _DEAD)]
+                if target == dead_block:
+                    continue
+                if target not in names:
+                    names[target] = f"q{len(names)}"
+                    queue.append(target)
+                minimal.add_transition(name, symbol, names[target])
+                minimal.alphabet.add(symbol)
+
+        return minimal
+
+    def write_fa_file(self, fa_file):
+        with open(fa_file, 'w') as file:
+            file.write(";".join(sorted(self.states)) + "\n")
+            file.write(f"{self.initial_state}\n")
+            file.write(";".join(sorted(self.final_states)) + "\n")
+            for from_state, trans in self.transitions.items():
+                for symbol, to_states in trans.items():
+                    for to_state in sorted(to_states):
+                        file.write(f"{from_state} {symbol} {to_state}\n")
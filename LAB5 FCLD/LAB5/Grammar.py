@@ -1,3 +1,8 @@
+import sys
+
+MEMO_LIMIT = 100000  # Default number of (non-terminal, index) results kept in packrat mode
+
+
 class Grammar:
     def __init__(self, N, E, P, S):
         """
@@ -12,6 +17,27 @@ class Grammar:
         self.S = S  # Start symbol
         self.tokens = []  # Tokens to parse
         self.index = 0  # Current position in the tokens
+        self.packrat = False  # Memoize (non-terminal, index) -> end index while parsing
+        self.memoLimit = MEMO_LIMIT  # Maximum number of memo entries, None for no limit
+        self.memoStats = {}  # Hits, misses, hit rate and evictions of the last packrat parse
+        self._memo = {}
+        self._compile()
+
+    def _compile(self):
+        """
+        Indexes the grammar once: symbol sets for membership tests, productions by global index and
+        every right-hand side pre-split into a tuple of interned symbols.
+        """
+        self._nonTerminals = frozenset(self.N)
+        self._terminals = frozenset(self.E)
+        self._byIndex = {}
+        self._splitProductions = {}
+        for lhs, rhs_list in self.P.items():
+            split = []
+            for rhs in rhs_list:
+                self._byIndex[rhs[1]] = (lhs, rhs[0])
+                split.append(tuple(sys.intern(symbol) for symbol in rhs[0].split()))
+            self._splitProductions[lhs] = tuple(split)
 
     @staticmethod
     def validate(N, E, P, S):
@@ -65,10 +91,10 @@ class Grammar:
             return Grammar(N, E, P, S)
 
     def isNonTerminal(self, value):
-        return value in self.N
+        return value in self._nonTerminals
 
     def isTerminal(self, value):
-        return value in self.E
+        return value in self._terminals
 
     def getProductionsFor(self, nonTerminal):
         if not self.isNonTerminal(nonTerminal):
@@ -76,24 +102,32 @@ class Grammar:
         return self.P.get(nonTerminal, [])
 
     def getProductionForIndex(self, index):
-        for lhs, rhs_list in self.P.items():
-            for rhs in rhs_list:
-                if rhs[1] == index:
-                    return lhs, rhs[0]
-        return None
+        return self._byIndex.get(index)
 
     def checkCFG(self):
         return Grammar.validate(self.N, self.E, self.P, self.S)
 
-    def parse(self, tokens):
+    def parse(self, tokens, packrat=None):
         """
         Parses a sequence of tokens using recursive descent.
         :param tokens: List of tokens to parse.
+        :param packrat: Memoize the result of every non-terminal at every index, so no alternative is parsed
+        twice and the parse stays linear-time; None keeps self.packrat.
         :return: True if the input matches the grammar; otherwise False.
         """
         self.tokens = tokens
         self.index = 0
-        if self._parse_non_terminal(self.S) and self.index == len(self.tokens):
+        if packrat is not None:
+            self.packrat = packrat
+        self._memo = {}
+        self.memoStats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        accepted = self._parse_non_terminal(self.S) and self.index == len(self.tokens)
+        if self.packrat:
+            lookups = self.memoStats["hits"] + self.memoStats["misses"]
+            self.memoStats["hitRate"] = self.memoStats["hits"] / lookups if lookups else 0.0
+            self._memo = {}
+        if accepted:
             print("Input string is valid.")
             return True
         else:
@@ -102,15 +136,42 @@ class Grammar:
 
     def _parse_non_terminal(self, non_terminal):
         """
-        Recursive descent for a non-terminal.
+        Recursive descent for a non-terminal. In packrat mode the end index (None on failure) is memoized per
+        (non-terminal, index): the first successful production always wins, so the result never changes.
         """
         if non_terminal not in self.P:
             raise Exception(f"No rules defined for non-terminal '{non_terminal}'")
+        if not self.packrat:
+            return self._parse_productions(non_terminal)
+
+        key = (non_terminal, self.index)
+        if key in self._memo:
+            self.memoStats["hits"] += 1
+            end = self._memo[key]
+            if end is None:
+                return False
+            self.index = end
+            return True
 
-        for production in self.P[non_terminal]:
+        self.memoStats["misses"] += 1
+        success = self._parse_productions(non_terminal)
+        if self.memoLimit is None or len(self._memo) < self.memoLimit:
+            self._memo[key] = self.index if success else None
+        elif self.memoLimit > 0:
+            # the oldest entry goes first, the parse is moving past its index
+            del self._memo[next(iter(self._memo))]
+            self.memoStats["evictions"] += 1
+            self._memo[key] = self.index if success else None
+        return success
+
+    def _parse_productions(self, non_terminal):
+        """
+        Tries the productions of a non-terminal in order, backtracking the index after each failed one.
+        """
+        for production in self._splitProductions[non_terminal]:
             start_index = self.index  # Save the state for backtracking
             success = True
-            for symbol in production[0].split():
+            for symbol in production:
                 if self.isNonTerminal(symbol):
                     if not self._parse_non_terminal(symbol):
                         success = False
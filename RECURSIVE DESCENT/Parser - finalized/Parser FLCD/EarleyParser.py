@@ -0,0 +1,349 @@
+import sys
+from bisect import insort
+from collections import namedtuple
+from Parser import Parser
+
+# Nodes of the shared packed parse forest. A symbol node spans the input from start to end; a terminal's
+# symbol node is a leaf. An item node stands for the first `dot` symbols of a production over its span and
+# binarizes long right-hand sides. A packed node is one way to derive its parent: `left` (an item node, None
+# at the start of a production) followed by `right` (a symbol node, None for an empty production), `split`
+# being the input index between the two.
+SymbolNode = namedtuple("SymbolNode", ["symbol", "start", "end"])
+ItemNode = namedtuple("ItemNode", ["production", "dot", "start", "end"])
+PackedNode = namedtuple("PackedNode", ["production", "split", "left", "right"])
+
+# Index of the augmented production S' -> S, the grammar files number their productions from 1
+START_PRODUCTION = 0
+
+
+class ParseForest:
+    def __init__(self, parser):
+        """
+        Shared packed parse forest over the Earley chart of a successful parse. Nodes are built on demand from
+        the chart: every Earley item (production, dot, origin) in set j is the item node over [origin, j], and
+        every recorded split is one of its packed nodes. The completed items that Leo's optimization skipped
+        are restored lazily, only as far down their chain as the nodes asked for need.
+
+        :param parser: EarleyParser whose chart the forest reads.
+        """
+        self._parser = parser
+        self._rules = parser._rules
+        self._non_terminals = parser._non_terminals
+        # per chart set: restored item -> splits, (non-terminal, origin) -> completed items, and one
+        # [topmost item, origin, symbol, finished] cursor per Leo shortcut taken in the set
+        self._restored = {}
+        self._completed = {}
+        self._cursors = {}
+        self.root = SymbolNode(parser._grammar.start_sym(), 0, len(parser._sequence))
+
+    def _links(self, end, item):
+        links = self._parser._chart[end].get(item, set())
+        restored = self._restored.get(end, {}).get(item)
+        return links if restored is None else links | restored
+
+    def _completed_items(self, end, origin):
+        """
+        :return: Dictionary (non-terminal, origin) -> completed items of the set, complete for every origin
+        from the given one on.
+        """
+        completed = self._completed.get(end)
+        if completed is None:
+            completed = self._completed[end] = {}
+            for production, dot, item_origin in self._parser._chart[end]:
+                non_terminal, symbols = self._rules[production]
+                if dot == len(symbols):
+                    completed.setdefault((non_terminal, item_origin), []).append((production, dot, item_origin))
+            for items in completed.values():
+                items.sort()
+            self._restored[end] = {}
+            self._cursors[end] = [[top, leo_origin, symbol, False]
+                                  for top, leo_origin, symbol in self._parser._leo_links[end]]
+
+        # walk the deterministic chains up from the completed symbols; origins only decrease along a chain
+        chart = self._parser._chart[end]
+        restored = self._restored[end]
+        waiting = self._parser._waiting
+        for cursor in self._cursors[end]:
+            top, chain_origin, symbol, finished = cursor
+            while not finished:
+                production, dot, item_origin = waiting[chain_origin][symbol][0]
+                if item_origin < origin:
+                    break
+                item = (production, dot + 1, item_origin)
+                if item not in restored and item not in chart:
+                    insort(completed.setdefault((self._rules[production][0], item_origin), []), item)
+                splits = restored.setdefault(item, set())
+                # a chain that meets an item already restored from here goes on the same way
+                finished = chain_origin in splits or item == top
+                splits.add(chain_origin)
+                chain_origin, symbol = item_origin, self._rules[production][0]
+            cursor[1:] = [chain_origin, symbol, finished]
+        return completed
+
+    def is_terminal(self, node):
+        return isinstance(node, SymbolNode) and node.symbol not in self._non_terminals
+
+    def families(self, node):
+        """
+        :param node: Symbol or item node of the forest.
+        :return: List of the packed nodes of the node, empty for a terminal.
+        """
+        if isinstance(node, SymbolNode):
+            if self.is_terminal(node):
+                return []
+            items = self._completed_items(node.end, node.start).get((node.symbol, node.start), ())
+        else:
+            items = [(node.production, node.dot, node.start)]
+
+        families = []
+        for production, dot, origin in items:
+            symbols = self._rules[production][1]
+            if dot == 0:
+                families.append(PackedNode(production, node.end, None, None))
+                continue
+            for split in sorted(self._links(node.end, (production, dot, origin))):
+                left = ItemNode(production, dot - 1, origin, split) if dot > 1 else None
+                families.append(PackedNode(production, split, left, SymbolNode(symbols[dot - 1], split, node.end)))
+        return families
+
+    def nodes(self):
+        """
+        :return: List of the symbol and item nodes reachable from the root.
+        """
+        seen = {self.root}
+        pending = [self.root]
+        while pending:
+            for packed in self.families(pending.pop()):
+                for child in (packed.left, packed.right):
+                    if child is not None and child not in seen:
+                        seen.add(child)
+                        pending.append(child)
+        return list(seen)
+
+    def is_ambiguous(self):
+        """
+        :return: True if some reachable node can be derived in more than one way, False otherwise.
+        """
+        return any(len(self.families(node)) > 1 for node in self.nodes())
+
+    def count_trees(self):
+        """
+        :return: Number of parse trees in the forest, infinity if a cyclic grammar gives infinitely many.
+        """
+        counts = {}
+        on_path = set()
+
+        def count(node):
+            if node is None or self.is_terminal(node):
+                return 1
+            if node in counts:
+                return counts[node]
+            if node in on_path:
+                return float("inf")
+            on_path.add(node)
+            total = 0
+            for packed in self.families(node):
+                left = count(packed.left)
+                right = count(packed.right) if left else 0
+                if right:
+                    total += left * right
+            on_path.discard(node)
+            counts[node] = total
+            return total
+
+        return self._deep(count, self.root)
+
+    def first_derivation(self):
+        """
+        :return: Working stack (preorder list of (non-terminal, production index) pairs and terminals) of the
+        first tree of the forest, taking the earliest production and split at every choice.
+        """
+        working_stack = []
+        on_path = set()
+
+        def derive(node):
+            # appends the node's derivation to the working stack, False (and nothing appended) if only a cycle
+            # of the grammar derives it from here
+            if node is None:
+                return True
+            if self.is_terminal(node):
+                working_stack.append(node.symbol)
+                return True
+            if node in on_path:
+                return False
+            on_path.add(node)
+            size = len(working_stack)
+            for packed in self.families(node):
+                if isinstance(node, SymbolNode):
+                    working_stack.append((node.symbol, packed.production))
+                if derive(packed.left) and derive(packed.right):
+                    on_path.discard(node)
+                    return True
+                del working_stack[size:]
+            on_path.discard(node)
+            return False
+
+        self._deep(derive, self.root)
+        return working_stack
+
+    def _deep(self, function, node):
+        # one level per nested node, and nodes nest at most once per input symbol and right-hand side symbol
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, 8 * (node.end + 1) + 1000))
+        try:
+            return function(node)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+
+class EarleyParser(Parser):
+    def __init__(self, grammar, output_file, input_file, leo=True):
+        """
+        Earley parser for any context-free grammar, left-recursive, ambiguous and with ε-productions included.
+        It runs in O(n³) time, O(n²) on unambiguous grammars and, thanks to Leo's optimization of right
+        recursion, in linear time on LR grammars. A successful parse keeps a shared packed parse forest of all
+        the trees (see get_forest); the working stack and tree are those of the forest's first tree.
+
+        :param grammar: Grammar for parsing.
+        :param output_file: File to store parsing progress and results.
+        :param input_file: File containing the sequence to parse.
+        :param leo: Use Leo's optimization for right recursion.
+        """
+        super().__init__(grammar, output_file, input_file)
+        self._leo = leo
+        self._forest = None
+        # production index -> (non-terminal, right-hand side symbols), 0 being the augmented S' -> S
+        self._rules = {START_PRODUCTION: (None, (grammar.start_sym(),))}
+        for production_index, (non_terminal, symbols, _) in grammar.productions_by_index.items():
+            self._rules[production_index] = (non_terminal, symbols)
+        self._non_terminals = frozenset(grammar.first_sets) | grammar.non_terminal_set
+        # one entry per input index: Earley items (production, dot, origin) -> splits, items by the symbol after
+        # their dot, Leo's topmost items by completed symbol and the (topmost item, origin, symbol) shortcuts
+        self._chart = []
+        self._waiting = []
+        self._transitive = []
+        self._leo_links = []
+
+    def get_forest(self):
+        """
+        :return: ParseForest of the last successful parse, None before one.
+        """
+        return self._forest
+
+    def get_item_count(self):
+        """
+        :return: Number of Earley items of the last parse.
+        """
+        return sum(len(items) for items in self._chart)
+
+    def parsing_strategy(self):
+        """Parse a sequence using Earley's algorithm."""
+        sequence = self._sequence
+        accepted = self._recognize()
+        if accepted:
+            self._state = 'f'
+            self._index = len(sequence)
+            self._input_stack = []
+            self._forest = ParseForest(self)
+            self._working_stack = self._forest.first_derivation()
+        else:
+            self._state = 'e'
+            self._index = max(index for index, items in enumerate(self._chart) if items)
+
+        with open(self._output_file, 'w') as file:
+            file.write(f"Earley items: {self.get_item_count()} in {len(self._chart)} sets\n")
+            if accepted:
+                file.write(f"Sequence {self._working_stack} is accepted!\n")
+
+        if self._state == 'e':
+            print(f'Error at index {self._index}!')
+        else:
+            print(f'Sequence {sequence} is accepted!')
+            print(self._working_stack)
+            self._build_parsing_tree()
+
+    def _recognize(self):
+        """
+        :return: True if the sequence derives from the start symbol, False otherwise.
+        """
+        sequence = self._sequence
+        rules = self._rules
+        non_terminals = self._non_terminals
+        nullable = self._grammar.nullable
+        size = len(sequence) + 1
+        self._chart = [{} for _ in range(size)]
+        self._waiting = [{} for _ in range(size)]
+        self._transitive = [{} for _ in range(size)]
+        self._leo_links = [[] for _ in range(size)]
+        queues = [[] for _ in range(size)]
+
+        def add(end, item, split):
+            splits = self._chart[end].get(item)
+            if splits is None:
+                splits = self._chart[end][item] = set()
+                queues[end].append(item)
+                symbols = rules[item[0]][1]
+                if item[1] < len(symbols):
+                    self._waiting[end].setdefault(symbols[item[1]], []).append(item)
+            if split is not None:
+                splits.add(split)
+
+        add(0, (START_PRODUCTION, 0, 0), None)
+        for end in range(size):
+            queue = queues[end]
+            predicted = set()
+            position = 0
+            while position < len(queue):
+                production, dot, origin = queue[position]
+                position += 1
+                non_terminal, symbols = rules[production]
+                if dot < len(symbols):
+                    symbol = symbols[dot]
+                    if symbol in non_terminals:
+                        if symbol not in predicted:
+                            predicted.add(symbol)
+                            for _, production_index in self._grammar.productions_for(symbol):
+                                add(end, (production_index, 0, end), None)
+                        if symbol in nullable:
+                            # Aycock and Horspool: a nullable symbol is also skipped right away
+                            add(end, (production, dot + 1, origin), end)
+                    elif end < len(sequence) and sequence[end] == symbol:
+                        add(end + 1, (production, dot + 1, origin), end)
+                    continue
+
+                top = self._topmost_item(origin, non_terminal) if self._leo and origin < end else None
+                if top is not None:
+                    add(end, top, None)
+                    self._leo_links[end].append((top, origin, non_terminal))
+                    continue
+                for production_index, item_dot, item_origin in list(self._waiting[origin].get(non_terminal, ())):
+                    add(end, (production_index, item_dot + 1, item_origin), origin)
+
+        return (START_PRODUCTION, 1, 0) in self._chart[-1]
+
+    def _topmost_item(self, origin, symbol):
+        """
+        Leo's transitive item: when exactly one item of the set waits for the symbol, as its last symbol,
+        completing the symbol deterministically completes that item, and so on up the chain.
+        :return: The completed item at the top of the chain, None if completing the symbol is not deterministic.
+        """
+        chain = []
+        top = None
+        while True:
+            transitive = self._transitive[origin]
+            if symbol in transitive:
+                top = transitive[symbol]
+                break
+            waiting = self._waiting[origin].get(symbol, ())
+            if len(waiting) != 1 or waiting[0][1] + 1 != len(self._rules[waiting[0][0]][1]):
+                transitive[symbol] = None
+                break
+            production, dot, item_origin = waiting[0]
+            chain.append((origin, symbol, (production, dot + 1, item_origin)))
+            origin, symbol = item_origin, self._rules[production][0]
+
+        for origin, symbol, completed in reversed(chain):
+            if top is None:
+                top = completed
+            self._transitive[origin][symbol] = top
+        return top
@@ -1,3 +1,12 @@
+import sys
+from GrammarTransformer import GrammarTransformer
+
+# Right-hand side text of an empty production
+EPSILON = "epsilon"
+# Lookahead past the end of the input; '$' separates symbols in the grammar files, so it is never a symbol
+END_MARKER = "$"
+
+
 class Grammar:
     def __init__(self):
         self.non_terminal_symbols = []
@@ -5,6 +14,30 @@ class Grammar:
         self.production_rules = {}
         self.starting_symbol = None
 
+        # Indexed form compiled at load time (see _compile): every right-hand side is pre-split into a
+        # tuple of interned symbols and of symbol ids, and productions are found by index in O(1).
+        self.symbols = []
+        self.symbol_ids = {}
+        self.terminal_set = frozenset()
+        self.non_terminal_set = frozenset()
+        self.productions_by_index = {}
+        self.production_symbol_ids = {}
+        self._productions_for = {}
+        self._next_index = {}
+
+        # Predictive parsing data computed from the indexed form (see _compute_first_follow, _build_ll1_table)
+        self.nullable = frozenset()
+        self.first_sets = {}
+        self.follow_sets = {}
+        self.ll1_table = {}
+        self.ll1_conflicts = []
+
+        # Set on grammars built by transformed(): the user's grammar and, for every production index, the index
+        # of the user's production it stands for (None for helper productions)
+        self.original_grammar = None
+        self.original_production = {}
+        self._tree_builders = {}
+
     def get_terminals(self):
         """
         :return: List of terminal symbols.
@@ -41,13 +74,98 @@ class Grammar:
 
     def get_specific_production(self, non_terminal, production_index):
         """
+        Text form of specific_production, as stored in production_rules.
         :param non_terminal: Non-terminal symbol to get the production for.
         :param production_index: The production index to retrieve.
-        :return: Specific production rule if found, None otherwise.
+        :return: Pair (right-hand side text, production index) if found, None otherwise.
         """
-        for production in self.production_rules[non_terminal]:
-            if production[1] == production_index:
-                return production
+        if self.specific_production(non_terminal, production_index) is None:
+            return None
+        return self.productions_by_index[production_index][2], production_index
+
+    def start_sym(self):
+        """
+        :return: The starting symbol.
+        """
+        return self.starting_symbol
+
+    def non_terminals_list(self):
+        """
+        :return: Set of non-terminal symbols, for O(1) membership tests.
+        """
+        return self.non_terminal_set
+
+    def terminals_list(self):
+        """
+        :return: Set of terminal symbols, for O(1) membership tests.
+        """
+        return self.terminal_set
+
+    def is_non_terminal(self, symbol):
+        """
+        :param symbol: Symbol to check.
+        :return: True if the symbol is a non-terminal of the grammar, False otherwise.
+        """
+        return symbol in self.non_terminal_set
+
+    def is_terminal(self, symbol):
+        """
+        :param symbol: Symbol to check.
+        :return: True if the symbol is a terminal of the grammar, False otherwise.
+        """
+        return symbol in self.terminal_set
+
+    def productions_for(self, non_terminal):
+        """
+        :param non_terminal: Non-terminal symbol to get productions for.
+        :return: Tuple of (right-hand side symbols, production index) pairs, in grammar order.
+        """
+        return self._productions_for.get(non_terminal, ())
+
+    def specific_production(self, non_terminal, production_index):
+        """
+        :param non_terminal: Non-terminal symbol to get the production for.
+        :param production_index: The production index to retrieve.
+        :return: Pair (right-hand side symbols, production index) if found, None if the non-terminal has no
+        production with that index; the canonical lookup, every parser uses this one.
+        """
+        production = self.productions_by_index.get(production_index)
+        if production is None or production[0] != non_terminal:
+            return None
+        return production[1], production_index
+
+    def production_by_index(self, production_index):
+        """
+        :param production_index: Global index of the production.
+        :return: Pair (non-terminal, right-hand side symbols) if found, None otherwise.
+        """
+        production = self.productions_by_index.get(production_index)
+        if production is None:
+            return None
+        return production[0], production[1]
+
+    def has_additional_production(self, non_terminal, production_index):
+        """
+        :param non_terminal: Non-terminal symbol to check.
+        :param production_index: Current production index.
+        :return: True if the non-terminal has a production after the given one, False otherwise.
+        """
+        return self._next_index.get((non_terminal, production_index)) is not None
+
+    def next_production_index(self, non_terminal, production_index):
+        """
+        :param non_terminal: Non-terminal symbol of the production.
+        :param production_index: Current production index.
+        :return: Index of the non-terminal's next production, None if this is its last one.
+        """
+        return self._next_index.get((non_terminal, production_index))
+
+    def symbol_id(self, symbol):
+        """
+        :param symbol: Symbol name.
+        :return: Interned id of the symbol, None for a symbol the grammar does not use.
+        """
+        return self.symbol_ids.get(symbol)
 
     def load_grammar_from_file(self, file_path):
         """
@@ -64,6 +182,236 @@ class Grammar:
 
             if not self._validate_cfg(raw_rules):
                 raise ValueError('The provided grammar is not a valid CFG')
+        self._compile()
+
+    def load_grammar(self, file_path):
+        """
+        :param file_path: Path to the file containing the grammar.
+        :raises ValueError: If the grammar is not a valid context-free grammar.
+        """
+        self.load_grammar_from_file(file_path)
+
+    def _intern_symbol(self, symbol):
+        symbol = sys.intern(symbol)
+        if symbol not in self.symbol_ids:
+            self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return symbol
+
+    def _compile(self):
+        """
+        Builds the indexed form of the loaded grammar, so parsing never splits or scans production strings.
+        """
+        self.symbols = []
+        self.symbol_ids = {}
+        self.non_terminal_set = frozenset(self._intern_symbol(symbol) for symbol in self.non_terminal_symbols)
+        self.terminal_set = frozenset(self._intern_symbol(symbol) for symbol in self.terminal_symbols)
+
+        self.productions_by_index = {}
+        self.production_symbol_ids = {}
+        self._productions_for = {}
+        self._next_index = {}
+        for non_terminal, productions in self.production_rules.items():
+            non_terminal = self._intern_symbol(non_terminal)
+            compiled = []
+            for text, production_index in productions:
+                if text == EPSILON:
+                    symbols = ()
+                else:
+                    symbols = tuple(self._intern_symbol(symbol) for symbol in text.split('$'))
+                self.productions_by_index[production_index] = (non_terminal, symbols, text)
+                self.production_symbol_ids[production_index] = tuple(self.symbol_ids[symbol] for symbol in symbols)
+                compiled.append((symbols, production_index))
+            self._productions_for[non_terminal] = tuple(compiled)
+            for (_, production_index), following in zip(compiled, compiled[1:] + [None]):
+                self._next_index[(non_terminal, production_index)] = following[1] if following else None
+
+        self._compute_first_follow()
+        self._build_ll1_table()
+
+    def _compute_first_follow(self):
+        """
+        Computes the nullable non-terminals and the FIRST and FOLLOW sets by iterating to a fixed point.
+        Any right-hand side symbol that is not a non-terminal counts as a terminal.
+        """
+        non_terminals = set(self.non_terminal_set) | set(self._productions_for)
+        productions = list(self.productions_by_index.values())
+        nullable = set()
+        first = {non_terminal: set() for non_terminal in non_terminals}
+
+        changed = True
+        while changed:
+            changed = False
+            for non_terminal, symbols, _ in productions:
+                size = len(first[non_terminal])
+                symbols_first, symbols_nullable = self._first_of(symbols, first, nullable)
+                first[non_terminal] |= symbols_first
+                if len(first[non_terminal]) != size:
+                    changed = True
+                if symbols_nullable and non_terminal not in nullable:
+                    nullable.add(non_terminal)
+                    changed = True
+
+        follow = {non_terminal: set() for non_terminal in non_terminals}
+        if self.starting_symbol in follow:
+            follow[self.starting_symbol].add(END_MARKER)
+        changed = True
+        while changed:
+            changed = False
+            for non_terminal, symbols, _ in productions:
+                # walking right to left, trailer holds what can come right after the current symbol
+                trailer = set(follow[non_terminal])
+                for symbol in reversed(symbols):
+                    if symbol not in first:
+                        trailer = {symbol}
+                        continue
+                    size = len(follow[symbol])
+                    follow[symbol] |= trailer
+                    if len(follow[symbol]) != size:
+                        changed = True
+                    trailer = trailer | first[symbol] if symbol in nullable else set(first[symbol])
+
+        self.nullable = frozenset(nullable)
+        self.first_sets = {non_terminal: frozenset(symbols) for non_terminal, symbols in first.items()}
+        self.follow_sets = {non_terminal: frozenset(symbols) for non_terminal, symbols in follow.items()}
+
+    @staticmethod
+    def _first_of(symbols, first, nullable):
+        """
+        :param symbols: Sequence of symbols.
+        :param first: FIRST sets of the non-terminals.
+        :param nullable: Set of nullable non-terminals.
+        :return: Pair (FIRST set of the sequence, True if the whole sequence can derive the empty string).
+        """
+        result = set()
+        for symbol in symbols:
+            if symbol not in first:
+                result.add(symbol)
+                return result, False
+            result |= first[symbol]
+            if symbol not in nullable:
+                return result, False
+        return result, True
+
+    def _build_ll1_table(self):
+        """
+        Builds the LL(1) table (non-terminal, lookahead terminal) -> production index. A cell claimed by several
+        productions is a conflict: it is recorded in ll1_conflicts and the table keeps the first production.
+        """
+        cells = {}
+        for production_index, (non_terminal, symbols, _) in sorted(self.productions_by_index.items()):
+            lookaheads, symbols_nullable = self._first_of(symbols, self.first_sets, self.nullable)
+            if symbols_nullable:
+                lookaheads |= self.follow_sets[non_terminal]
+            for terminal in lookaheads:
+                cells.setdefault((non_terminal, terminal), []).append(production_index)
+
+        self.ll1_table = {cell: indices[0] for cell, indices in cells.items()}
+        self.ll1_conflicts = sorted((non_terminal, terminal, tuple(indices))
+                                    for (non_terminal, terminal), indices in cells.items() if len(indices) > 1)
+
+    def first(self, symbols):
+        """
+        :param symbols: A symbol or a sequence of symbols.
+        :return: FIRST set of the symbols, containing EPSILON if they can derive the empty string.
+        """
+        if isinstance(symbols, str):
+            symbols = (symbols,)
+        result, symbols_nullable = self._first_of(symbols, self.first_sets, self.nullable)
+        if symbols_nullable:
+            result.add(EPSILON)
+        return frozenset(result)
+
+    def follow(self, non_terminal):
+        """
+        :param non_terminal: Non-terminal symbol.
+        :return: FOLLOW set of the non-terminal, END_MARKER standing for the end of the input.
+        """
+        return self.follow_sets.get(non_terminal, frozenset())
+
+    def is_nullable(self, symbol):
+        """
+        :param symbol: Symbol to check.
+        :return: True if the symbol can derive the empty string, False otherwise.
+        """
+        return symbol in self.nullable
+
+    def is_ll1(self):
+        """
+        :return: True if no cell of the LL(1) table is claimed by two productions, False otherwise.
+        """
+        return not self.ll1_conflicts
+
+    def ll1_production(self, non_terminal, lookahead):
+        """
+        :param non_terminal: Non-terminal on top of the input stack.
+        :param lookahead: Current input terminal, END_MARKER at the end of the input.
+        :return: Index of the production to expand with, None if the table has no entry.
+        """
+        return self.ll1_table.get((non_terminal, lookahead))
+
+    def transformed(self):
+        """
+        Builds an equivalent grammar for the top-down parsers: direct and indirect left recursion is removed and
+        common prefixes are left factored (see GrammarTransformer). New non-terminals are named after the one
+        they come from with a trailing "'", and productions are numbered again from 1.
+        Non-terminals that derive no terminal string are dropped with the productions that use them.
+        :return: The transformed Grammar; to_original_working_stack maps its parses back to this grammar.
+        :raises ValueError: If the starting symbol derives no terminal string, or if left recursion hides behind a
+        nullable prefix and cannot be removed.
+        """
+        order, rules = GrammarTransformer(self).transform()
+        grammar = Grammar()
+        grammar.non_terminal_symbols = list(order)
+        grammar.terminal_symbols = list(self.terminal_symbols)
+        grammar.starting_symbol = self.starting_symbol
+        grammar.original_grammar = self
+
+        production_index = 0
+        for non_terminal in order:
+            for symbols, builder, origin in rules[non_terminal]:
+                production_index += 1
+                grammar.production_rules.setdefault(non_terminal, []).append(
+                    ('$'.join(symbols) if symbols else EPSILON, production_index))
+                grammar.original_production[production_index] = origin
+                grammar._tree_builders[production_index] = builder
+                for symbol in symbols:
+                    if symbol not in rules and symbol not in grammar.terminal_symbols:
+                        grammar.terminal_symbols.append(symbol)
+        grammar._compile()
+        return grammar
+
+    def to_original_working_stack(self, working_stack):
+        """
+        :param working_stack: Working stack of a successful parse with this grammar.
+        :return: The same derivation as a working stack of the original grammar, a copy of the given one if
+        this grammar was not built by transformed().
+        """
+        if self.original_grammar is None or not working_stack:
+            return list(working_stack)
+
+        # The working stack lists the derivation in preorder, so walking it backwards every production finds
+        # the values of its children on top of the stack, first child topmost.
+        values = []
+        for entry in reversed(working_stack):
+            if isinstance(entry, tuple):
+                children_start = len(values) - len(self.productions_by_index[entry[1]][1])
+                children = values[children_start:][::-1]
+                del values[children_start:]
+                values.append(self._tree_builders[entry[1]](children))
+            else:
+                values.append([entry])
+
+        original_stack = []
+        pending = list(reversed(values.pop()))
+        while pending:
+            node = pending.pop()
+            if isinstance(node, tuple):
+                original_stack.append((node[0], node[1]))
+                pending.extend(reversed(node[2]))
+            else:
+                original_stack.append(node)
+        return original_stack
 
     def display_non_terminals(self):
         """
@@ -0,0 +1,238 @@
+def _node_builder(non_terminal, production_index):
+    """Tree builder of an untouched production: one node of the original grammar over all the children."""
+    def build(values):
+        return [(non_terminal, production_index, [node for value in values for node in value])]
+    return build
+
+
+def _substitution_builder(outer, inner, inner_length):
+    """Tree builder of A -> δ γ, made from A -> B γ by replacing B with its production B -> δ."""
+    def build(values):
+        return outer([inner(values[:inner_length])] + values[inner_length:])
+    return build
+
+
+def _head_builder(base):
+    """Tree builder of A -> β A', made from A -> β: the tail A' wraps the β node in the recursive nodes."""
+    def build(values):
+        return values[-1](base(values[:-1]))
+    return build
+
+
+def _tail_builder(recursive):
+    """Tree builder of A' -> α A', made from A -> A α: the node built so far becomes the leftmost child."""
+    def build(values):
+        return lambda accumulated: values[-1](recursive([accumulated] + values[:-1]))
+    return build
+
+
+def _empty_tail_builder(values):
+    """Tree builder of A' -> ε, which ends the chain of recursive nodes."""
+    return lambda accumulated: accumulated
+
+
+def _prefix_builder(values):
+    """Tree builder of A -> α A'': the suffix A'' gets the children of the shared prefix α."""
+    return values[-1](values[:-1])
+
+
+def _suffix_builder(original):
+    """Tree builder of A'' -> β, made from A -> α β: the prefix children go first."""
+    def build(values):
+        return lambda prefix: original(prefix + values)
+    return build
+
+
+class GrammarTransformer:
+    def __init__(self, grammar):
+        """
+        Rewrites a compiled grammar for the top-down parsers: direct and indirect left recursion is removed and
+        common prefixes are left factored. Every production keeps a tree builder, so a derivation in the
+        rewritten grammar can be turned back into a derivation in the original one.
+
+        Productions are (right-hand side symbols, tree builder, original production index or None) triples.
+        A tree builder gets the values of the production's children, a terminal's value being [terminal], and
+        returns either a list of (non-terminal, original production index, children) nodes or, for the new
+        helper non-terminals, a function that completes the nodes of their parent.
+
+        :param grammar: Compiled Grammar to transform, it is not modified.
+        """
+        self._order = []
+        for non_terminal in list(grammar.non_terminal_symbols) + list(grammar.production_rules):
+            if non_terminal not in self._order:
+                self._order.append(non_terminal)
+        self._used_names = set(grammar.symbols) | set(grammar.terminal_symbols) | set(self._order)
+        self._start = grammar.start_sym()
+
+        self._rules = {non_terminal: [] for non_terminal in self._order}
+        for production_index, (non_terminal, symbols, _) in sorted(grammar.productions_by_index.items()):
+            self._rules[non_terminal].append(
+                (symbols, _node_builder(non_terminal, production_index), production_index))
+
+    def transform(self):
+        """
+        :return: Pair (non-terminals in order, {non-terminal: list of productions}) of the rewritten grammar.
+        :raises ValueError: If the starting symbol derives no terminal string, or if left recursion is left, which
+        happens when it hides behind a nullable prefix.
+        """
+        self._remove_unproductive()
+        self._eliminate_left_recursion()
+        self._left_factor()
+        left_recursive = self._left_recursive_non_terminals()
+        if left_recursive:
+            raise ValueError(f"Cannot remove the left recursion of {sorted(left_recursive)}")
+        return self._order, self._rules
+
+    def _fresh_name(self, non_terminal):
+        name = non_terminal + "'"
+        while name in self._used_names:
+            name += "'"
+        self._used_names.add(name)
+        return name
+
+    def _add_helper(self, parent, productions):
+        helper = self._fresh_name(parent)
+        position = self._order.index(parent) + 1
+        while position < len(self._order) and self._order[position].startswith(parent + "'"):
+            position += 1
+        self._order.insert(position, helper)
+        self._rules[helper] = productions
+        return helper
+
+    def _left_corners(self, non_terminal, through_nullable=frozenset()):
+        """
+        :param non_terminal: Non-terminal to start from.
+        :param through_nullable: Nullable non-terminals that a leftmost symbol may be skipped over.
+        :return: Set of non-terminals that can start a sentential form derived from the non-terminal.
+        """
+        corners = set()
+        pending = [non_terminal]
+        while pending:
+            for symbols, _, _ in self._rules.get(pending.pop(), ()):
+                for symbol in symbols:
+                    if symbol in self._rules and symbol not in corners:
+                        corners.add(symbol)
+                        pending.append(symbol)
+                    if symbol not in through_nullable:
+                        break
+        return corners
+
+    def _remove_unproductive(self):
+        """
+        Drops the non-terminals that derive no terminal string, such as A in A -> A a, together with every
+        production that uses one. Left recursion elimination would leave them without a single production.
+        """
+        rules = self._rules
+
+        def is_productive(symbols):
+            return all(symbol in productive or symbol not in rules for symbol in symbols)
+
+        productive = set()
+        changed = True
+        while changed:
+            changed = False
+            for non_terminal, productions in rules.items():
+                if non_terminal not in productive and any(is_productive(symbols) for symbols, _, _ in productions):
+                    productive.add(non_terminal)
+                    changed = True
+        if self._start not in productive:
+            raise ValueError(f"The starting symbol {self._start} derives no terminal string")
+
+        self._order = [non_terminal for non_terminal in self._order if non_terminal in productive]
+        self._rules = {non_terminal: [production for production in rules[non_terminal] if is_productive(production[0])]
+                       for non_terminal in self._order}
+
+    def _eliminate_left_recursion(self):
+        """
+        Paull's algorithm: in grammar order, a leading non-terminal that was already processed is replaced by
+        its productions, earliest first, then the direct left recursion that this exposes is removed. Only the
+        non-terminals that can really lead back to the current one are substituted, so the rest of the grammar is
+        kept. Each one is substituted once: a processed non-terminal only leads with later ones, unless an
+        ε-production lets an earlier one through, and that left recursion is reported by transform().
+        """
+        processed = []
+        for non_terminal in list(self._order):
+            for earlier in processed:
+                if non_terminal not in self._left_corners(earlier):
+                    continue
+                productions = []
+                for symbols, builder, origin in self._rules[non_terminal]:
+                    if symbols and symbols[0] == earlier:
+                        for inner_symbols, inner_builder, _ in self._rules[earlier]:
+                            productions.append((inner_symbols + symbols[1:],
+                                                _substitution_builder(builder, inner_builder, len(inner_symbols)),
+                                                origin))
+                    else:
+                        productions.append((symbols, builder, origin))
+                self._rules[non_terminal] = productions
+            self._eliminate_direct_left_recursion(non_terminal)
+            processed.append(non_terminal)
+
+    def _eliminate_direct_left_recursion(self, non_terminal):
+        """
+        Rewrites A -> A α | β as A -> β A' and A' -> α A' | ε. A production A -> A derives nothing new and is
+        dropped.
+        """
+        productions = self._rules[non_terminal]
+        if not any(symbols and symbols[0] == non_terminal for symbols, _, _ in productions):
+            return
+
+        tails = []
+        heads = []
+        for symbols, builder, origin in productions:
+            if symbols and symbols[0] == non_terminal:
+                if len(symbols) > 1:
+                    tails.append((symbols[1:], _tail_builder(builder), origin))
+            else:
+                heads.append((symbols, builder, origin))
+
+        helper = self._add_helper(non_terminal, [])
+        self._rules[helper] = [(symbols + (helper,), builder, origin) for symbols, builder, origin in tails]
+        self._rules[helper].append(((), _empty_tail_builder, None))
+        self._rules[non_terminal] = [(symbols + (helper,), _head_builder(builder), origin)
+                                     for symbols, builder, origin in heads]
+
+    def _left_factor(self):
+        """
+        Rewrites A -> α β1 | α β2 as A -> α A'' and A'' -> β1 | β2, taking the longest prefix shared by all the
+        productions that start with the same symbol, until no two productions of a non-terminal start alike.
+        """
+        pending = list(self._order)
+        while pending:
+            non_terminal = pending.pop(0)
+            groups = {}
+            for production in self._rules[non_terminal]:
+                if production[0]:
+                    groups.setdefault(production[0][0], []).append(production)
+
+            productions = []
+            for production in self._rules[non_terminal]:
+                group = groups.get(production[0][0]) if production[0] else None
+                if group is None or len(group) == 1:
+                    productions.append(production)
+                    continue
+                if production is not group[0]:
+                    continue
+
+                prefix_length = 1
+                while all(len(symbols) > prefix_length and symbols[prefix_length] == group[0][0][prefix_length]
+                          for symbols, _, _ in group):
+                    prefix_length += 1
+                helper = self._add_helper(non_terminal, [(symbols[prefix_length:], _suffix_builder(builder), origin)
+                                                         for symbols, builder, origin in group])
+                productions.append((group[0][0][:prefix_length] + (helper,), _prefix_builder, None))
+                pending.append(helper)
+            self._rules[non_terminal] = productions
+
+    def _left_recursive_non_terminals(self):
+        nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for non_terminal, productions in self._rules.items():
+                if non_terminal not in nullable and any(all(symbol in nullable for symbol in symbols)
+                                                        for symbols, _, _ in productions):
+                    nullable.add(non_terminal)
+                    changed = True
+        return {non_terminal for non_terminal in self._order
+                if non_terminal in self._left_corners(non_terminal, frozenset(nullable))}
@@ -0,0 +1,82 @@
+from Grammar import END_MARKER
+from Parser import Parser
+
+
+class LL1Parser(Parser):
+    def __init__(self, grammar, output_file, input_file):
+        """
+        Table-driven predictive parser. It takes the same inputs as the recursive descent Parser and ends with
+        the same working stack and tree, but picks every production from the grammar's LL(1) table instead of
+        backtracking, so a sequence is parsed in linear time.
+
+        :param grammar: Grammar for parsing, it must be LL(1).
+        :param output_file: File to store parsing progress and results.
+        :param input_file: File containing the sequence to parse.
+        """
+        if not grammar.is_ll1():
+            conflicts = ", ".join(f"({non_terminal}, {terminal}) -> {list(indices)}"
+                                  for non_terminal, terminal, indices in grammar.ll1_conflicts)
+            raise ValueError(f"Grammar is not LL(1), conflicting table entries: {conflicts}")
+        super().__init__(grammar, output_file, input_file)
+        self._expected = set()
+
+    def get_expected(self):
+        """
+        :return: Set of terminals that were acceptable at the error index, empty if the parse did not fail.
+        """
+        return self._expected
+
+    def parsing_strategy(self):
+        """Parse a sequence by predictive parsing with the grammar's LL(1) table."""
+        sequence = self._sequence
+        grammar = self._grammar
+        working_stack = self._working_stack
+        # top of the stack is the last element, so pushing and popping a symbol is O(1)
+        stack = list(reversed(self._input_stack))
+        index = self._index
+        moves = []
+
+        while self._state == 'q':
+            lookahead = sequence[index] if index < len(sequence) else END_MARKER
+            if not stack:
+                if lookahead == END_MARKER:
+                    moves.append('success\n')
+                    self._state = 'f'
+                else:
+                    self._expected = {END_MARKER}
+                    self._state = 'e'
+            elif grammar.is_non_terminal(stack[-1]):
+                non_terminal = stack[-1]
+                production_index = grammar.ll1_production(non_terminal, lookahead)
+                if production_index is None:
+                    self._expected = {terminal for (table_non_terminal, terminal) in grammar.ll1_table
+                                      if table_non_terminal == non_terminal}
+                    self._state = 'e'
+                    continue
+                moves.append('expand\n')
+                stack.pop()
+                working_stack.append((non_terminal, production_index))
+                stack.extend(reversed(grammar.specific_production(non_terminal, production_index)[0]))
+            elif stack[-1] == lookahead:
+                moves.append('advance\n')
+                working_stack.append(stack.pop())
+                index += 1
+            else:
+                self._expected = {stack[-1]}
+                self._state = 'e'
+
+        self._index = index
+        self._input_stack = list(reversed(stack))
+        with open(self._output_file, 'w') as file:
+            file.writelines(moves)
+            if self._state == 'f':
+                file.write(f"Sequence {working_stack} is accepted!\n")
+
+        if self._state == 'e':
+            # the working stack holds an unfinished derivation, so no tree is built
+            print(f'Error at index {self._index}!')
+            print(f'Expected one of: {sorted(self._expected)}')
+        else:
+            print(f'Sequence {sequence} is accepted!')
+            print(working_stack)
+            self._build_parsing_tree()
@@ -0,0 +1,259 @@
+import sys
+from collections import OrderedDict
+from Grammar import END_MARKER
+from Parser import Parser
+
+# Default number of derivation ends kept in the memo, over all its entries
+MEMO_LIMIT = 1000000
+
+
+class _Alternatives:
+    def __init__(self, productions, follow, start):
+        """
+        Memo entry of one (non-terminal, input index): the distinct ends of its derivations, found lazily in the
+        order the backtracking parser reaches them, and the state of the depth-first search that finds them.
+
+        :param productions: Tuple of (right-hand side symbols, production index) pairs of the non-terminal.
+        :param follow: FOLLOW set of the non-terminal.
+        :param start: Input index the derivations start at.
+        """
+        self.productions = productions
+        self.follow = follow
+        self.ends = []
+        # end -> (production index, end of every right-hand side symbol) of the first derivation reaching it
+        self.derivations = {}
+        # production being searched, input index before each matched symbol and after the last, and which
+        # alternative of its symbol each match is
+        self.production = 0
+        self.positions = [start]
+        self.choices = []
+        self.backtracking = False
+        self.exhausted = False
+
+
+class PackratParser(Parser):
+    def __init__(self, grammar, output_file, input_file, memo_limit=MEMO_LIMIT):
+        """
+        Memoizing variant of the recursive descent Parser. For every (non-terminal, input index) it keeps the input
+        positions where a derivation of the non-terminal can end, in the order the backtracking parser reaches
+        them, each with the first derivation that gets there. An end followed by a terminal outside the
+        non-terminal's FOLLOW set is skipped, since no parse of the whole sequence can use it, and the ends are
+        only searched for when a caller asks for one more. On LL-style grammars an entry then holds about one end,
+        so parsing takes linear time and memory. It accepts the same sequences and ends with the same working
+        stack and tree as Parser. A left-recursive call finds only the ends already known.
+
+        :param grammar: Grammar for parsing.
+        :param output_file: File to store parsing progress and results.
+        :param input_file: File containing the sequence to parse.
+        :param memo_limit: Maximum number of ends kept in the memo, the oldest entries are evicted first and
+        searched again if needed; None for no limit.
+        """
+        super().__init__(grammar, output_file, input_file)
+        self._memo_limit = memo_limit
+        # (non-terminal, start) -> _Alternatives, oldest first
+        self._memo = OrderedDict()
+        self._stored_ends = 0
+        # keys whose search is running, outermost first, with their depth; and the keys whose entries were
+        # searched while a left-recursive call to the key was cut short
+        self._active = []
+        self._active_depth = {}
+        self._tainted = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._furthest = 0
+
+    def get_memo_stats(self):
+        """
+        :return: Dictionary with the memo hits, misses, hit rate, evictions, current number of entries and of
+        ends stored in them.
+        """
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "entries": len(self._memo),
+            "ends": self._stored_ends,
+        }
+
+    def parsing_strategy(self):
+        """Parse a sequence using memoized recursive descent parsing."""
+        sequence = self._sequence
+        start = self._grammar.start_sym()
+        recursion_limit = sys.getrecursionlimit()
+        # two frames per nested search, and derivations nest a few non-terminals deep per input symbol
+        sys.setrecursionlimit(max(recursion_limit, 16 * len(sequence) + 1000))
+        try:
+            accepted = False
+            alternative = 0
+            entry = self._entry(start, 0, alternative)
+            while entry is not None and not accepted:
+                accepted = entry.ends[alternative] == len(sequence)
+                alternative += 1
+                entry = self._entry(start, 0, alternative)
+            if accepted:
+                self._working_stack = self._derivation(start, 0, len(sequence))
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        if accepted:
+            self._state = 'f'
+            self._index = len(sequence)
+            self._input_stack = []
+        else:
+            self._state = 'e'
+            self._index = self._furthest
+
+        stats = self.get_memo_stats()
+        with open(self._output_file, 'w') as file:
+            file.write(f"Memo hits: {stats['hits']} misses: {stats['misses']} "
+                       f"hit rate: {stats['hit_rate']:.2%} evictions: {stats['evictions']}\n")
+            if accepted:
+                file.write(f"Sequence {self._working_stack} is accepted!\n")
+
+        if self._state == 'e':
+            print(f'Error at index {self._index}!')
+        else:
+            print(f'Sequence {sequence} is accepted!')
+            print(self._working_stack)
+            self._build_parsing_tree()
+
+    def _entry(self, non_terminal, start, alternative):
+        """
+        :return: The _Alternatives of the non-terminal at the given input index, searched until it has more than
+        `alternative` ends; None if the derivations have no more ends than that.
+        """
+        key = (non_terminal, start)
+        entry = self._memo.get(key)
+        if entry is not None and (alternative < len(entry.ends) or entry.exhausted):
+            self._hits += 1
+            return entry if alternative < len(entry.ends) else None
+        self._misses += 1
+
+        depth = self._active_depth.get(key)
+        if depth is not None:
+            # left recursion: the entries searched since then must not outlive this call's search
+            self._tainted.setdefault(key, set()).update(self._active[depth + 1:])
+            return None
+
+        if entry is None:
+            entry = self._memo[key] = _Alternatives(self._grammar.productions_for(non_terminal),
+                                                    self._grammar.follow(non_terminal), start)
+        self._active_depth[key] = len(self._active)
+        self._active.append(key)
+        try:
+            while len(entry.ends) <= alternative and self._search(entry):
+                pass
+        finally:
+            self._active.pop()
+            del self._active_depth[key]
+            for tainted_key in self._tainted.pop(key, ()):
+                self._forget(tainted_key)
+
+        if self._memo_limit is not None and self._stored_ends > self._memo_limit:
+            self._evict()
+        return entry if alternative < len(entry.ends) else None
+
+    def _search(self, entry):
+        """
+        Resumes the depth-first search of the entry's productions up to the next new end.
+        :return: True if an end was added, False once every derivation has been tried.
+        """
+        sequence = self._sequence
+        positions, choices = entry.positions, entry.choices
+        while entry.production < len(entry.productions):
+            symbols, production_index = entry.productions[entry.production]
+            if entry.backtracking:
+                # the next alternative of the last matched symbol, dropping the symbols that have none left
+                entry.backtracking = False
+                while choices:
+                    choice = choices.pop() + 1
+                    positions.pop()
+                    end = self._symbol_end(symbols[len(choices)], positions[-1], choice)
+                    if end is not None:
+                        choices.append(choice)
+                        positions.append(end)
+                        break
+                else:
+                    entry.production += 1
+                    continue
+
+            while len(choices) < len(symbols):
+                end = self._symbol_end(symbols[len(choices)], positions[-1], 0)
+                if end is None:
+                    break
+                choices.append(0)
+                positions.append(end)
+            entry.backtracking = True
+            if len(choices) < len(symbols):
+                continue
+            end = positions[-1]
+            lookahead = sequence[end] if end < len(sequence) else END_MARKER
+            if lookahead in entry.follow and end not in entry.derivations:
+                entry.derivations[end] = (production_index, tuple(positions[1:]))
+                entry.ends.append(end)
+                self._stored_ends += 1
+                return True
+
+        entry.exhausted = True
+        return False
+
+    def _symbol_end(self, symbol, start, alternative):
+        """
+        :return: Input index after the alternative-th distinct derivation of the symbol from the given index,
+        None if there is no such derivation.
+        """
+        if self._grammar.is_non_terminal(symbol):
+            entry = self._entry(symbol, start, alternative)
+            return None if entry is None else entry.ends[alternative]
+        if alternative == 0 and start < len(self._sequence) and self._sequence[start] == symbol:
+            self._furthest = max(self._furthest, start + 1)
+            return start + 1
+        return None
+
+    def _forget(self, key):
+        entry = self._memo.pop(key, None)
+        if entry is not None:
+            self._stored_ends -= len(entry.ends)
+
+    def _evict(self):
+        # oldest entries first; an entry whose search is running is moved to the back instead
+        for _ in range(len(self._memo)):
+            if self._stored_ends <= self._memo_limit:
+                return
+            key, entry = self._memo.popitem(last=False)
+            if key in self._active_depth:
+                self._memo[key] = entry
+                continue
+            self._stored_ends -= len(entry.ends)
+            self._evictions += 1
+
+    def _derivation(self, non_terminal, start, end):
+        """
+        :return: Working stack of the memoized derivation of the non-terminal over the input from start to end.
+        """
+        working_stack = []
+        pending = [(non_terminal, start, end)]
+        while pending:
+            entry = pending.pop()
+            if not isinstance(entry, tuple):
+                working_stack.append(entry)
+                continue
+            non_terminal, start, end = entry
+            alternatives = self._memo.get((non_terminal, start))
+            alternative = 0
+            # an evicted entry is searched again, up to the end it had reached
+            while alternatives is None or end not in alternatives.derivations:
+                alternatives = self._entry(non_terminal, start, alternative)
+                alternative += 1
+            production_index, symbol_ends = alternatives.derivations[end]
+            working_stack.append((non_terminal, production_index))
+            symbols = self._grammar.specific_production(non_terminal, production_index)[0]
+            children = []
+            for symbol, symbol_end in zip(symbols, symbol_ends):
+                children.append((symbol, start, symbol_end) if self._grammar.is_non_terminal(symbol) else symbol)
+                start = symbol_end
+            pending.extend(reversed(children))
+        return working_stack
@@ -1,6 +1,7 @@
 import logging
 from Symbol import Symbol
 from PrintParser import PrintParser
+from PifReader import GRAMMAR_TERMINALS, PifReader
 
 class Parser:
     def __init__(self, grammar, output_file, input_file):
@@ -36,12 +37,21 @@ class Parser:
             file.write("")
 
     def _read_sequence(self, sequence_file):
-        """Read input sequence from a file."""
+        """
+        Read input sequence from a file: a binary PIF, a text PIF ('token position type' lines, as written
+        by the scanner) or one terminal per line.
+        """
+        if PifReader.is_binary_pif(sequence_file):
+            with PifReader(sequence_file) as reader:
+                self._sequence = reader.terminals()
+            return
+
         with open(sequence_file) as file:
-            if sequence_file == "PIF.out":
+            if sequence_file.endswith("PIF.out"):
                 for line in file:
-                    tokens = line.split("'")
-                    self._sequence.append(tokens[1])
+                    if line.strip():
+                        token, _, token_type = line.rstrip("\n").rsplit(" ", 2)
+                        self._sequence.append(GRAMMAR_TERMINALS.get(token_type, token))
             else:
                 for line in file:
                     self._sequence.append(line.strip())
@@ -109,14 +119,14 @@ class Parser:
                     self._success()
                 elif not self._input_stack:
                     self._momentary_insuccess()
-                elif self._input_stack[0] in self._grammar.non_terminals_list():
+                elif self._grammar.is_non_terminal(self._input_stack[0]):
                     self._expand()
                 elif self._index < len(sequence) and self._input_stack[0] == sequence[self._index]:
                     self._advance()
                 else:
                     self._momentary_insuccess()
             elif self._state == 'b':
-                if self._working_stack[-1] in self._grammar.terminals_list():
+                if self._grammar.is_terminal(self._working_stack[-1]):
                     self._backtrack()
                 else:
                     self._try_next_production()
@@ -133,10 +143,9 @@ class Parser:
         """Expand the first non-terminal in the input stack using its first production."""
         self.write_to_output_file('expand\n')
         non_terminal = self._input_stack.pop(0)
-        production = self._grammar.productions_for(non_terminal)[0]
-        self._working_stack.append((non_terminal, production[1]))
-        production_elements = production[0].split('$')
-        self._input_stack = production_elements + self._input_stack
+        symbols, production_index = self._grammar.productions_for(non_terminal)[0]
+        self._working_stack.append((non_terminal, production_index))
+        self._input_stack = list(symbols) + self._input_stack
 
     def _advance(self):
         """Advance to the next symbol in the input sequence."""
@@ -162,20 +171,29 @@ class Parser:
         self.write_to_output_file('another try\n')
         last_entry = self._working_stack.pop()
 
-        if self._grammar.has_additional_production(last_entry[0], last_entry[1]):
+        non_terminal, production_index = last_entry
+        production_length = self._production_length(non_terminal, production_index)
+        next_index = self._grammar.next_production_index(non_terminal, production_index)
+
+        if next_index is not None:
+            # replace the symbols of the failed production with those of the next one
             self._state = 'q'
-            self._working_stack.append((last_entry[0], last_entry[1] + 1))
-            production_elements = self._grammar.specific_production(last_entry[0], last_entry[1] + 1)[0]
-            production_length = len(production_elements.split('$'))
-            self._input_stack = self._input_stack[production_length:]
-            self._input_stack = production_elements.split('$') + self._input_stack
-        elif self._index == 0 and last_entry[0] == self._grammar.start_sym():
+            self._working_stack.append((non_terminal, next_index))
+            next_symbols = self._grammar.specific_production(non_terminal, next_index)[0]
+            self._input_stack = list(next_symbols) + self._input_stack[production_length:]
+        elif self._index == 0 and non_terminal == self._grammar.start_sym():
             self._state = 'e'
         else:
-            production_elements = self._grammar.specific_production(last_entry[0], last_entry[1])
-            production_length = len(production_elements[0].split('$'))
             self._input_stack = self._input_stack[production_length:]
-            self._input_stack.insert(0, last_entry[0])
+            self._input_stack.insert(0, non_terminal)
+
+    def _production_length(self, non_terminal, production_index):
+        """
+        Number of right-hand side symbols of a production, from the grammar's pre-split form; 0 if the
+        non-terminal has no such production.
+        """
+        production = self._grammar.specific_production(non_terminal, production_index)
+        return 0 if production is None else len(production[0])
 
     def _success(self):
         """Mark the parsing as successful."""
@@ -183,54 +201,28 @@ class Parser:
         self._state = 'f'
 
     def _build_parsing_tree(self):
-        """Construct the parsing tree based on the working stack."""
-        parent_index = -1
-
-        for i, entry in enumerate(self._working_stack):
-            if isinstance(entry, tuple):
-                self._tree.append(Symbol(entry[0]))
-                self._tree[i].production = entry[1]
-            else:
-                self._tree.append(Symbol(entry))
-
-        for i, entry in enumerate(self._working_stack):
+        """
+        Construct the parsing tree based on the working stack. The working stack lists the derivation in
+        preorder, so one pass with a stack of the productions still waiting for children links every symbol.
+        """
+        self._tree = []
+        # a transformed grammar reports the tree in terms of the user's grammar
+        grammar = self._grammar.original_grammar or self._grammar
+        working_stack = self._grammar.to_original_working_stack(self._working_stack)
+        # entries are [father index, children still expected, index of the last child seen]
+        open_productions = []
+        for i, entry in enumerate(working_stack):
+            symbol = Symbol(entry[0] if isinstance(entry, tuple) else entry)
+            self._tree.append(symbol)
+            if open_productions:
+                father = open_productions[-1]
+                symbol.father = father[0]
+                if father[2] != -1:
+                    self._tree[father[2]].sibling = i
+                father[1] -= 1
+                father[2] = i
             if isinstance(entry, tuple):
-                if self._tree[i].father == -1:
-                    self._tree[i].father = parent_index
-                parent_index = i
-
-                production_length = len(self._grammar.specific_production(entry[0], entry[1])[0].split('$'))
-                child_indices = [i + j for j in                 range(1, production_length + 1)]
-
-                # Adjust child indices based on nested productions
-                for j in range(len(child_indices)):
-                    if self._tree[child_indices[j]].production != -1:
-                        offset = self._get_subtree_length(child_indices[j])
-                        for k in range(j + 1, len(child_indices)):
-                            child_indices[k] += offset
-                            if child_indices[k] >= len(self._tree):
-                                child_indices[k] -= 1
-
-                # Establish sibling and father relationships
-                for j in range(len(child_indices) - 1):
-                    self._tree[child_indices[j]].sibling = child_indices[j + 1]
-                    if self._tree[child_indices[j]].father == -1:
-                        self._tree[child_indices[j]].father = parent_index
-                    if j == len(child_indices) - 2 and self._tree[child_indices[j + 1]].father == -1:
-                        self._tree[child_indices[j + 1]].father = parent_index
-            else:
-                if self._tree[i].father == -1:
-                    self._tree[i].father = parent_index
-                parent_index = -1
-
-    def _get_subtree_length(self, index):
-        """Recursively compute the length of a subtree starting at the given index."""
-        production_length = len(self._grammar.specific_production(
-            self._working_stack[index][0], self._working_stack[index][1])[0].split('$'))
-        total_length = production_length
-
-        for j in range(1, production_length + 1):
-            if isinstance(self._working_stack[index + j], tuple):
-                total_length += self._get_subtree_length(index + j)
-
-        return total_length
+                symbol.production = entry[1]
+                open_productions.append([i, len(grammar.specific_production(*entry)[0]), -1])
+            while open_productions and open_productions[-1][1] == 0:
+                open_productions.pop()
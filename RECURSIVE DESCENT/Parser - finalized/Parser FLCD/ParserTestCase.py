@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from Grammar import Grammar
+
+
+class ParserTestCase(unittest.TestCase):
+    """Test case writing its grammars, sequences and parser output to a temporary directory."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_file(self, name, lines):
+        """
+        :param name: File name inside the temporary directory.
+        :param lines: Lines of the file.
+        :return: Path of the written file.
+        """
+        path = self.path(name)
+        with open(path, 'w') as file:
+            file.write("\n".join(lines))
+        return path
+
+    def load(self, rules):
+        """
+        :param rules: Lines of a grammar file.
+        :return: Grammar loaded from them.
+        """
+        grammar = Grammar()
+        grammar.load_grammar(self.write_file("grammar.txt", rules))
+        return grammar
+
+    def parse(self, parser_class, grammar, terminals, **options):
+        """
+        :return: Parser of the given class that has parsed the terminals, its output written to the temporary
+        directory.
+        """
+        parser = parser_class(grammar, self.path("out.txt"), self.write_file("sequence.txt", terminals), **options)
+        parser.parsing_strategy()
+        return parser
@@ -0,0 +1,95 @@
+import mmap
+import struct
+import sys
+
+MAGIC = b"PIFB"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxIIIBBBx")
+TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+# scanner token kinds that the grammars know under another terminal name
+GRAMMAR_TERMINALS = {"identifier": "identifier", "int": "constant", "string": "constant"}
+# the binary PIF names the codes of these kinds '<kind>', keywords and operators by their text
+KIND_NAMES = {f"<{kind}>": kind for kind in GRAMMAR_TERMINALS}
+
+
+class PifReader:
+    def __init__(self, pif_file):
+        """
+        Reader for the binary PIF written by the scanner. The file is memory-mapped and the token code,
+        symbol table position and line number columns are read in place, without copying. Each column is
+        stored in the narrowest width its values fit in, and positions are stored plus one so that the -1
+        of keywords and operators fits an unsigned column.
+
+        :param pif_file: Path to the binary PIF file.
+        :raises ValueError: If the file is not a binary PIF or was written with another byte order.
+        """
+        self.pif_file = pif_file
+        with open(pif_file, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = view = memoryview(self._mmap)
+
+        if len(view) < HEADER.size:
+            self.close()
+            raise ValueError(f"'{pif_file}' is not a binary PIF")
+        (magic, version, byte_order, count, name_count, table_size,
+         code_width, position_width, line_width) = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{pif_file}' is not a version {VERSION} binary PIF")
+        if byte_order != (0 if sys.byteorder == "little" else 1):
+            self.close()
+            raise ValueError(f"'{pif_file}' was written on a machine with a different byte order")
+
+        offset = self._aligned(HEADER.size)
+        self.token_names = str(view[offset:offset + table_size], 'utf-8').split("\n") if name_count else []
+        offset = self._aligned(offset + table_size)
+        self.codes = view[offset:offset + code_width * count].cast(TYPECODES[code_width])
+        offset = self._aligned(offset + code_width * count)
+        self.positions = view[offset:offset + position_width * count].cast(TYPECODES[position_width])
+        offset = self._aligned(offset + position_width * count)
+        self.lines = view[offset:offset + line_width * count].cast(TYPECODES[line_width])
+
+    @staticmethod
+    def _aligned(offset):
+        return offset + (-offset % 4)
+
+    @staticmethod
+    def is_binary_pif(path):
+        """
+        :param path: Path to a PIF file.
+        :return: True if the file starts with the binary PIF magic, False otherwise.
+        """
+        with open(path, 'rb') as file:
+            return file.read(len(MAGIC)) == MAGIC
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        """
+        :param index: Index of the PIF entry.
+        :return: Tuple (token name, symbol table position, line number); identifiers and constants are
+                 named by their kind, as '<identifier>', '<int>' or '<string>'.
+        """
+        return self.token_names[self.codes[index]], self.positions[index] - 1, self.lines[index]
+
+    def terminals(self):
+        """
+        :return: List with the grammar terminal of every entry: identifiers and constants by their kind,
+                 keywords and operators by their own text.
+        """
+        table = [GRAMMAR_TERMINALS[KIND_NAMES[name]] if name in KIND_NAMES else name for name in self.token_names]
+        return [table[code] for code in self.codes]
+
+    def close(self):
+        for name in ("codes", "positions", "lines", "_view"):
+            if hasattr(self, name):
+                getattr(self, name).release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,4 +1,4 @@
-from Grammar import ContextFreeGrammar
+from Grammar import Grammar
 from Parser import Parser
 from PrintParser import PrintParser
 
@@ -19,8 +19,8 @@ def main():
             out_file = "out1.txt"
         elif choice == '2':
             grammar_file = "g2.txt"
-            input_file = "seq.txt"
-            out_file = "PIF.out"
+            input_file = "seq2.txt"
+            out_file = "out2.txt"
         elif choice == '0':
             print("Exiting the program...")
             break
@@ -28,19 +28,30 @@ def main():
             print("Invalid choice. Try again.")
             continue
 
-        grammar = ContextFreeGrammar()
+        grammar = Grammar()
         try:
             grammar.load_grammar(grammar_file)
         except FileNotFoundError:
             print(f"Error: The file '{grammar_file}' could not be found.")
             return
 
-        parser = Parser(grammar, out_file=out_file, in_file=input_file)
-        parser.parsingStrategy('')
+        input_file = input(f"Enter the sequence file (leave empty for '{input_file}'): ").strip() or input_file
+
+        # the recursive descent parser loops on left recursion, so it parses the transformed grammar and
+        # the results are mapped back to the productions of the grammar file
+        try:
+            transformed = grammar.transformed()
+        except ValueError as error:
+            print(f"Error: The grammar cannot be parsed top-down: {error}")
+            continue
+
+        parser = Parser(transformed, out_file, input_file)
+        parser.parsing_strategy()
 
-        if parser.getState() == 'f':
+        if parser.get_state() == 'f':
             print("Parsing completed successfully.")
-            output = PrintParser(parser.getTree())
+            print(f"Derivation in '{grammar_file}': {transformed.to_original_working_stack(parser.get_working_stack())}")
+            output = PrintParser(parser.get_tree())
             output.printToFile('tree.txt')
             print("The parsing tree has been saved to 'tree.txt'.")
         else:
@@ -0,0 +1,67 @@
+import unittest
+from Grammar import Grammar
+from Parser import Parser
+from EarleyParser import EarleyParser, SymbolNode
+from ParserTestCase import ParserTestCase
+
+class TestEarley(ParserTestCase):
+
+    def test_same_result_as_backtracking(self):
+        grammar = Grammar()
+        grammar.load_grammar("g3.txt")
+        sequence = ["identifier", "*", "(", "identifier", "+", "identifier", ")", "+", "identifier"]
+        parser = self.parse(Parser, grammar, sequence)
+        earley_parser = self.parse(EarleyParser, grammar, sequence)
+        self.assertEqual(earley_parser.get_state(), 'f')
+        self.assertEqual(earley_parser.get_working_stack(), parser.get_working_stack())
+        self.assertEqual([vars(symbol) for symbol in earley_parser.get_tree()],
+                         [vars(symbol) for symbol in parser.get_tree()])
+
+    def test_left_recursion(self):
+        grammar = Grammar()
+        grammar.load_grammar("g2.txt")
+        parser = self.parse(EarleyParser, grammar, ["BEGIN", "identifier", "=", "identifier", "-", "constant", "+",
+                                                    "identifier", ";", "END"])
+        self.assertEqual(parser.get_state(), 'f')
+        # left associative: (identifier - constant) + identifier
+        self.assertEqual(parser.get_working_stack()[7:10], [("expression", 15), ("expression", 16),
+                                                            ("expression", 14)])
+        self.assertFalse(parser.get_forest().is_ambiguous())
+
+    def test_ambiguous_forest(self):
+        grammar = self.load(["N = E", "E = +, identifier", "S = E", "P =",
+                             "E -> E$+$E | identifier"])
+        parser = self.parse(EarleyParser, grammar, ["identifier", "+", "identifier", "+", "identifier",
+                                                    "+", "identifier"])
+        forest = parser.get_forest()
+        self.assertTrue(forest.is_ambiguous())
+        self.assertEqual(forest.count_trees(), 5)
+        self.assertEqual(len(forest.families(forest.root)), 3)
+        self.assertEqual(forest.root, SymbolNode("E", 0, 7))
+
+    def test_epsilon_productions(self):
+        grammar = self.load(["N = S, A, B", "E = a, b", "S = S", "P =",
+                             "S -> A$B$a",
+                             "A -> epsilon | a",
+                             "B -> epsilon | b$B"])
+        parser = self.parse(EarleyParser, grammar, ["b", "b", "a"])
+        self.assertEqual(parser.get_state(), 'f')
+        self.assertEqual(parser.get_working_stack(), [("S", 1), ("A", 2), ("B", 5), "b", ("B", 5), "b", ("B", 4),
+                                                      "a"])
+        parser = self.parse(EarleyParser, grammar, ["a", "a", "b"])
+        self.assertEqual(parser.get_state(), 'e')
+        self.assertEqual(parser.get_index(), 2)
+
+    def test_leo_right_recursion(self):
+        grammar = self.load(["N = S", "E = a, b", "S = S", "P =",
+                             "S -> a$S | b"])
+        sequence = ["a"] * 200 + ["b"]
+        with_leo = self.parse(EarleyParser, grammar, sequence)
+        without_leo = self.parse(EarleyParser, grammar, sequence, leo=False)
+        self.assertEqual(with_leo.get_working_stack(), without_leo.get_working_stack())
+        self.assertLess(with_leo.get_item_count(), without_leo.get_item_count())
+        self.assertEqual(with_leo.get_forest().count_trees(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,15 +49,27 @@ class TestParser(unittest.TestCase):
         self.assertEqual(self.parser.get_index(), 0)
 
     def test_another_try(self):
+        # A -> a$A (production 2) failed, A -> b$A (production 3) replaces its symbols
         self.parser.set_state("b")
-        self.parser.set_index(2)
-        self.parser.set_working_stack([("S", 1), "a", ("A", 1)])
-        self.parser.set_input_stack(["b", "b"])
+        self.parser.set_index(1)
+        self.parser.set_working_stack([("S", 1), "a", ("A", 2)])
+        self.parser.set_input_stack(["a", "A"])
         self.parser._try_next_production()
-        self.assertEqual(self.parser.get_working_stack(), [("S", 1), "a", ("A", 2)])
-        self.assertEqual(self.parser.get_input_stack(), ["b", "b"])
+        self.assertEqual(self.parser.get_working_stack(), [("S", 1), "a", ("A", 3)])
+        self.assertEqual(self.parser.get_input_stack(), ["b", "A"])
         self.assertEqual(self.parser.get_state(), 'q')
 
+    def test_another_try_without_production(self):
+        # A has no production 1, so there is no next production either: move back and pop
+        self.parser.set_state("b")
+        self.parser.set_index(1)
+        self.parser.set_working_stack([("S", 1), "a", ("A", 1)])
+        self.parser.set_input_stack(["b"])
+        self.parser._try_next_production()
+        self.assertEqual(self.parser.get_working_stack(), [("S", 1), "a"])
+        self.assertEqual(self.parser.get_input_stack(), ["A", "b"])
+        self.assertEqual(self.parser.get_state(), 'b')
+
 
 if __name__ == "__main__":
     unittest.main()
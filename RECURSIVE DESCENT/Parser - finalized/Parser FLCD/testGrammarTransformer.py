@@ -0,0 +1,71 @@
+import unittest
+from Grammar import Grammar
+from Parser import Parser
+from ParserTestCase import ParserTestCase
+
+class TestGrammarTransformer(ParserTestCase):
+
+    def test_direct_left_recursion(self):
+        grammar = Grammar()
+        grammar.load_grammar("g2.txt")
+        transformed = grammar.transformed()
+        self.assertEqual(transformed.production_rules["expression"], [("term$expression'", 25)])
+        self.assertEqual(transformed.production_rules["expression'"],
+                         [("+$term$expression'", 26), ("-$term$expression'", 27), ("epsilon", 28)])
+        self.assertEqual([transformed.original_production[index] for index in (25, 26, 27, 28)], [14, 15, 16, None])
+
+        parser = self.parse(Parser, transformed, ["BEGIN", "identifier", "=", "identifier", "-", "constant",
+                                                  "+", "identifier", ";", "END"])
+        self.assertEqual(parser.get_state(), 'f')
+        original_stack = transformed.to_original_working_stack(parser.get_working_stack())
+        # left associative: (identifier - constant) + identifier
+        self.assertEqual(original_stack[7:12], [("expression", 15), ("expression", 16), ("expression", 14),
+                                                ("term", 17), ("factor", 20)])
+
+    def test_indirect_left_recursion(self):
+        grammar = self.load(["N = S, A", "E = a, b, c, d", "S = S", "P =",
+                             "S -> A$a | b",
+                             "A -> S$c | A$d | a"])
+        transformed = grammar.transformed()
+        self.assertEqual(transformed.production_rules["A"], [("b$c$A'", 3), ("a$A'", 4)])
+        self.assertEqual(transformed.production_rules["A'"], [("a$c$A'", 5), ("d$A'", 6), ("epsilon", 7)])
+
+        parser = self.parse(Parser, transformed, ["a", "d", "a", "c", "a"])
+        self.assertEqual(parser.get_state(), 'f')
+        self.assertEqual(transformed.to_original_working_stack(parser.get_working_stack()),
+                         [("S", 1), ("A", 3), ("S", 1), ("A", 4), ("A", 5), "a", "d", "a", "c", "a"])
+        self.assertEqual([symbol.value for symbol in parser.get_tree()][:3], ["S", "A", "S"])
+
+    def test_left_factoring(self):
+        grammar = Grammar()
+        grammar.load_grammar("g2.txt")
+        transformed = grammar.transformed()
+        self.assertEqual(transformed.production_rules["iostmt"], [("read$identifier$;", 18), ("write$iostmt'", 19)])
+        self.assertEqual(transformed.production_rules["iostmt'"], [("identifier$;", 20), ("constant$;", 21)])
+        self.assertEqual([transformed.original_production[index] for index in (19, 20, 21)], [None, 24, 25])
+
+    def test_hidden_left_recursion(self):
+        grammar = self.load(["N = S, B", "E = a, b", "S = S", "P =",
+                             "S -> B$S$a | b",
+                             "B -> epsilon | a"])
+        with self.assertRaises(ValueError):
+            grammar.transformed()
+
+    def test_unproductive_non_terminal(self):
+        grammar = self.load(["N = S, B", "E = a, b", "S = S", "P =",
+                             "S -> B$a | b",
+                             "B -> B$a"])
+        transformed = grammar.transformed()
+        self.assertEqual(transformed.non_terminal_symbols, ["S"])
+        self.assertEqual(transformed.production_rules["S"], [("b", 1)])
+        self.assertEqual(transformed.original_production[1], 2)
+        self.assertEqual(self.parse(Parser, transformed, ["b"]).get_state(), 'f')
+
+        grammar = self.load(["N = S", "E = a", "S = S", "P =",
+                             "S -> S$a"])
+        with self.assertRaises(ValueError):
+            grammar.transformed()
+
+
+if __name__ == '__main__':
+    unittest.main()
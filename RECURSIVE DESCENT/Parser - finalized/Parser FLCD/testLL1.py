@@ -0,0 +1,49 @@
+import unittest
+from Grammar import Grammar, END_MARKER, EPSILON
+from Parser import Parser
+from LL1Parser import LL1Parser
+from ParserTestCase import ParserTestCase
+
+class TestLL1(ParserTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.grammar = Grammar()
+        self.grammar.load_grammar("g3.txt")  # LL(1) expression grammar
+
+    def test_first(self):
+        self.assertEqual(self.grammar.first("expression"), {"(", "identifier"})
+        self.assertEqual(self.grammar.first("expression_rest"), {"+", EPSILON})
+        self.assertEqual(self.grammar.first(["term_rest", "expression_rest"]), {"*", "+", EPSILON})
+
+    def test_follow(self):
+        self.assertEqual(self.grammar.follow("expression_rest"), {")", END_MARKER})
+        self.assertEqual(self.grammar.follow("factor"), {"*", "+", ")", END_MARKER})
+
+    def test_conflicts(self):
+        self.assertTrue(self.grammar.is_ll1())
+        grammar = Grammar()
+        grammar.load_grammar("g1.txt")
+        self.assertFalse(grammar.is_ll1())
+        self.assertEqual(grammar.ll1_conflicts, [("A", "a", (2, 4))])
+        with self.assertRaises(ValueError):
+            LL1Parser(grammar, self.path("out.txt"), "seq.txt")
+
+    def test_same_working_stack(self):
+        sequence = ["identifier", "+", "identifier", "*", "(", "identifier", ")"]
+        parser = self.parse(Parser, self.grammar, sequence)
+        ll1_parser = self.parse(LL1Parser, self.grammar, sequence)
+        self.assertEqual(ll1_parser.get_state(), 'f')
+        self.assertEqual(ll1_parser.get_working_stack(), parser.get_working_stack())
+        self.assertEqual([vars(symbol) for symbol in ll1_parser.get_tree()],
+                         [vars(symbol) for symbol in parser.get_tree()])
+
+    def test_error(self):
+        parser = self.parse(LL1Parser, self.grammar, ["identifier", "+", "*"])
+        self.assertEqual(parser.get_state(), 'e')
+        self.assertEqual(parser.get_index(), 2)
+        self.assertEqual(parser.get_expected(), {"(", "identifier"})
+
+
+if __name__ == '__main__':
+    unittest.main()
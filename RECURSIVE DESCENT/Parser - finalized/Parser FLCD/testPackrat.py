@@ -0,0 +1,61 @@
+import unittest
+from Grammar import Grammar
+from Parser import Parser
+from PackratParser import PackratParser
+from ParserTestCase import ParserTestCase
+
+class TestPackrat(ParserTestCase):
+
+    def setUp(self):
+        super().setUp()
+        grammar = Grammar()
+        grammar.load_grammar("g2.txt")
+        self.grammar = grammar.transformed()  # g2 without left recursion
+
+    def test_same_result_as_backtracking(self):
+        sequence = ["BEGIN", "identifier", "=", "identifier", "+", "constant", ";",
+                    "if", "identifier", "<", "constant", "{", "write", "identifier", ";", "}", "END"]
+        parser = self.parse(Parser, self.grammar, sequence)
+        packrat_parser = self.parse(PackratParser, self.grammar, sequence)
+        self.assertEqual(packrat_parser.get_state(), 'f')
+        self.assertEqual(packrat_parser.get_working_stack(), parser.get_working_stack())
+        self.assertEqual([vars(symbol) for symbol in packrat_parser.get_tree()],
+                         [vars(symbol) for symbol in parser.get_tree()])
+
+    def test_memo_stats(self):
+        grammar = self.load(["N = S, A", "E = a, b, c", "S = S", "P =",
+                             "S -> A$b | A$c",
+                             "A -> a$A | a"])
+        # the second production of S finds the ends of A at 0 in the memo
+        parser = self.parse(PackratParser, grammar, ["a", "a", "a", "c"])
+        stats = parser.get_memo_stats()
+        self.assertEqual(parser.get_state(), 'f')
+        self.assertGreater(stats["hits"], 0)
+        self.assertEqual(stats["hit_rate"], stats["hits"] / (stats["hits"] + stats["misses"]))
+        self.assertEqual(stats["evictions"], 0)
+
+    def test_linear_memo(self):
+        statement = ["identifier", "=", "identifier", "*", "(", "identifier", "-", "constant", ")", ";"]
+        ends = []
+        for count in (20, 40, 60):
+            parser = self.parse(PackratParser, self.grammar, ["BEGIN"] + statement * count + ["END"])
+            self.assertEqual(parser.get_state(), 'f')
+            ends.append(parser.get_memo_stats()["ends"])
+        # ends followed by a terminal outside FOLLOW are never stored, so each statement adds the same number
+        self.assertEqual(ends[2] - ends[1], ends[1] - ends[0])
+
+    def test_memo_limit(self):
+        statement = ["read", "identifier", ";"]
+        parser = self.parse(PackratParser, self.grammar, ["BEGIN"] + statement * 10 + ["END"], memo_limit=5)
+        self.assertEqual(parser.get_state(), 'f')
+        self.assertLessEqual(parser.get_memo_stats()["ends"], 5)
+        self.assertGreater(parser.get_memo_stats()["evictions"], 0)
+
+    def test_error(self):
+        parser = self.parse(PackratParser, self.grammar, ["BEGIN", "read", "identifier", "identifier", "END"])
+        self.assertEqual(parser.get_state(), 'e')
+        self.assertEqual(parser.get_index(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()